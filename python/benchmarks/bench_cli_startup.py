@@ -0,0 +1,68 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""
+Wall time of flow CLI invocations, each run in a fresh interpreter. Exits with 1 when the median of a command
+exceeds the budget. "job query" talks to the configured fate flow server, a refused connection is still timed,
+it is not retried so no retry backoff is included.
+Run from python/ directory
+    python benchmarks/bench_cli_startup.py --budget 0.5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+COMMANDS = [
+    ["--help"],
+    ["version"],
+    ["job", "--help"],
+    ["job", "query", "--job-id", "bench"],
+]
+
+
+def measure(args, repeat):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([os.getcwd(), os.environ.get("PYTHONPATH", "")]))
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "fate_client.flow_cli.flow"] + args, env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        durations.append(time.perf_counter() - start)
+
+    return statistics.median(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="flow CLI startup benchmark")
+    parser.add_argument("--budget", type=float, default=0.5, help="seconds allowed for each command")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'command':<40}{'median(s)':>12}")
+    for command in COMMANDS:
+        duration = measure(command, args.repeat)
+        print(f"{'flow ' + ' '.join(command):<40}{duration:>12.3f}")
+        failed = failed or duration > args.budget
+
+    if failed:
+        print(f"flow CLI startup regression: budget {args.budget}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
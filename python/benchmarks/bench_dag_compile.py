@@ -0,0 +1,74 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""
+Compile-to-submit latency of large DAGs: time of pipeline.compile() followed by exporting the submission dict,
+for a fresh compile and for recompiles after a single parameter change. Run from python/ directory
+    python benchmarks/bench_dag_compile.py --tasks 50 100 200 --hosts 10
+"""
+import argparse
+import statistics
+import time
+
+from fate_client.pipeline import FateFlowPipeline
+from fate_client.pipeline.components.fate import CoordinatedLR, PSI, Reader
+
+
+def build_pipeline(task_num, host_num):
+    pipeline = FateFlowPipeline().set_parties(guest="9999", host=[str(10000 + i) for i in range(host_num)],
+                                              arbiter="9999")
+    reader_0 = Reader("reader_0")
+    reader_0.guest.task_parameters(namespace="experiment", name="guest")
+    reader_0.hosts[list(range(host_num))].task_parameters(namespace="experiment", name="host")
+    psi_0 = PSI("psi_0", input_data=reader_0.outputs["output_data"])
+
+    lr_tasks = []
+    for i in range(task_num):
+        lr = CoordinatedLR(f"lr_{i}", epochs=3, batch_size=100, train_data=psi_0.outputs["output_data"])
+        lr.hosts[i % host_num].task_parameters(batch_size=50)
+        lr_tasks.append(lr)
+
+    pipeline.add_tasks([reader_0, psi_0] + lr_tasks)
+    return pipeline, lr_tasks
+
+
+def compile_to_submit(pipeline):
+    start = time.perf_counter()
+    pipeline.compile()
+    pipeline._dag.dag_spec.export()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DAG compile-to-submit benchmark")
+    parser.add_argument("--tasks", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--hosts", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8}{'hosts':>8}{'first(ms)':>12}{'recompile(ms)':>16}")
+    for task_num in args.tasks:
+        pipeline, lr_tasks = build_pipeline(task_num, args.hosts)
+        first = compile_to_submit(pipeline)
+
+        recompiles = []
+        for i in range(args.repeat):
+            lr_tasks[i % task_num].task_parameters(epochs=i + 1)
+            recompiles.append(compile_to_submit(pipeline))
+
+        print(f"{task_num:>8}{args.hosts:>8}{first * 1000:>12.2f}{statistics.median(recompiles) * 1000:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""
+Import time of the pipeline packages, each module is imported in a fresh interpreter. Exits with 1 when an import
+exceeds the budget or loads torch / transformers, which only NN components should need. Run from python/ directory
+    python benchmarks/bench_import_time.py --budget 1.5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+MODULES = [
+    "fate_client.pipeline",
+    "fate_client.pipeline.components.fate",
+]
+
+HEAVY_MODULES = ["torch", "transformers"]
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+print(",".join(m for m in {heavy_modules!r} if m in sys.modules))
+"""
+
+
+def measure(module, repeat):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([os.getcwd(), os.environ.get("PYTHONPATH", "")]))
+    durations, heavy = [], ""
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, "-c", _PROBE.format(module=module,
+                                                                           heavy_modules=HEAVY_MODULES)],
+                                         env=env, text=True).splitlines()
+        durations.append(float(output[0]))
+        heavy = output[1] if len(output) > 1 else ""
+
+    return statistics.median(durations), heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pipeline import time benchmark")
+    parser.add_argument("--budget", type=float, default=1.5, help="seconds allowed for each import")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'module':<45}{'median(s)':>12}  heavy modules loaded")
+    for module in MODULES:
+        duration, heavy = measure(module, args.repeat)
+        print(f"{module:<45}{duration:>12.3f}  {heavy or '-'}")
+        if duration > args.budget or heavy:
+            failed = True
+
+    if failed:
+        print(f"import time regression: budget {args.budget}s, heavy modules should load lazily")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
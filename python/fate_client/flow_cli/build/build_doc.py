@@ -148,7 +148,7 @@ def write_init(init_list):
 def make_markdown():
     _init_comm_list = []
     os.makedirs(BASE_DIR, exist_ok=True)
-    for i in [cmd for cmd in flow_cli.commands]:
+    for i in flow_cli.list_commands(None):
         group = flow_cli.get_command(click.pass_context, i)
         _comm = comm
         if isinstance(group, Group):
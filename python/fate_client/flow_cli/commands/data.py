@@ -49,18 +49,23 @@ def upload(ctx, **kwargs):
 
 @data.command("upload-file")
 @cli_args.CONF_PATH
+@cli_args.CHUNKED
 @click.pass_context
-def upload_file(ctx, **kwargs):
+def upload_file(ctx, chunked, **kwargs):
     """
     \b
-    -description: Upload file to storage engine.
+    -description: Upload file to storage engine. With --chunked the file is sent in parts and a rerun resumes
+    a failed upload, part_size and concurrency may be set in the conf.
 
     \b
-    -usage: flow data upload-file -c examples/upload/upload_guest.csv
+    -usage: flow data upload-file -c examples/upload/upload_guest.csv [--chunked]
     """
     config_data = preprocess(**kwargs)
     client: FlowClient = ctx.obj["client"]
-    response = client.data.upload_file(**config_data)
+    if chunked:
+        response = client.data.upload_file_chunked(**config_data)
+    else:
+        response = client.data.upload_file(**config_data)
     prettify(response)
 
 
@@ -159,18 +159,26 @@ def delete_model(ctx, **kwargs):
 @cli_args.PARTYID_REQUIRED
 @cli_args.TASK_NAME_REQUIRED
 @cli_args.PATH_REQUIRED
+@cli_args.DATA_FORMAT
 @click.pass_context
-def download_data(ctx, **kwargs):
+def download_data(ctx, data_format, **kwargs):
     """
     \b
-    -description: Download Data
+    -description: Download Data, csv files are converted to parquet or feather if --format is given
 
     \b
-    -usage: flow output download-data -j xxx -r guest -p 9999 -tn lr_0 -o /data/project/xx
+    -usage: flow output download-data -j xxx -r guest -p 9999 -tn lr_0 -o /data/project/xx --format parquet
 
     """
     client: FlowClient = ctx.obj["client"]
     response = client.output.download_data(**kwargs)
+    if data_format != "csv" and response.get("code") == 0:
+        from fate_client.flow_sdk.utils.output_data import materialize_output_dir
+        try:
+            converted = materialize_output_dir(response["directory"], response["directory"], fmt=data_format)
+            response["converted"] = [str(path) for path in converted]
+        except ImportError as e:
+            response = {"code": 100, "message": str(e)}
     prettify(response)
 
 
@@ -0,0 +1,141 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+import json
+import shlex
+
+import click
+
+from ..utils import cli_args
+
+NESTED_COMMANDS = {"shell", "batch", "init"}
+
+
+def parse_command(line):
+    """
+    Args:
+        line: flow command without the leading "flow", shell words or a json list of arguments
+
+    Returns:
+        list of arguments, empty for blank and comment lines
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return []
+    if line.startswith("["):
+        args = json.loads(line)
+        if not isinstance(args, list):
+            raise ValueError(f"json command should be a list of arguments, {line} found")
+        return [str(arg) for arg in args]
+
+    args = shlex.split(line)
+    if args and args[0] == "flow":
+        args = args[1:]
+    return args
+
+
+def run_command(ctx, args):
+    """
+    Run one flow command in this process, sharing ctx.obj and so the FlowClient and its session
+
+    Returns:
+        True if the command succeeded
+    """
+    if args[0] in NESTED_COMMANDS:
+        click.echo(f"flow {args[0]} is not supported here", err=True)
+        return False
+
+    root = ctx.find_root()
+    try:
+        root.command.main(args=args, prog_name=root.info_name, obj=ctx.obj, standalone_mode=False)
+    except click.exceptions.Exit as e:
+        return e.exit_code == 0
+    except click.ClickException as e:
+        e.show()
+        return False
+    except click.Abort:
+        raise
+    except Exception as e:
+        click.echo(f"{type(e).__name__}: {e}", err=True)
+        return False
+
+    return True
+
+
+@click.command("shell")
+@click.pass_context
+def shell(ctx):
+    """
+    \b
+    -description: Run flow commands interactively over one client and connection, exit with "exit" or Ctrl-D.
+    \b
+    -usage: flow shell
+    """
+    click.echo('flow shell, type commands without "flow", e.g. job query -j 202301010000000000')
+    while True:
+        try:
+            line = input("flow> ")
+        except EOFError:
+            click.echo("")
+            break
+        except KeyboardInterrupt:
+            click.echo("")
+            continue
+
+        if line.strip() in ("exit", "quit"):
+            break
+
+        try:
+            args = parse_command(line)
+        except ValueError as e:
+            click.echo(f"invalid command: {e}", err=True)
+            continue
+
+        if args:
+            try:
+                run_command(ctx, args)
+            except click.Abort:
+                click.echo("")
+
+
+@click.command("batch")
+@cli_args.COMMAND_FILE_REQUIRED
+@cli_args.STOP_ON_ERROR
+@click.pass_context
+def batch(ctx, command_file, stop_on_error):
+    """
+    \b
+    -description: Run flow commands of a file over one client and connection.
+    \b
+    -usage: flow batch -f commands.txt
+    """
+    failed = 0
+    for line_number, line in enumerate(command_file, 1):
+        try:
+            args = parse_command(line)
+        except ValueError as e:
+            click.echo(f"line {line_number}: invalid command: {e}", err=True)
+            succeeded = False
+        else:
+            succeeded = run_command(ctx, args) if args else True
+
+        if not succeeded:
+            failed += 1
+            if stop_on_error:
+                click.echo(f"line {line_number}: failed, stopped", err=True)
+                break
+
+    if failed:
+        ctx.exit(1)
@@ -15,32 +15,117 @@
 #
 
 
-import click
-from ruamel import yaml
+import hashlib
+import json
+import os
 from pathlib import Path
-from fate_client.flow_sdk import FlowClient
-from fate_client.flow_cli.commands import client, job, data, log, model, output, permission, provider, server, site, table, task, test
-from fate_client.flow_cli.utils.cli_utils import prettify, connect_service
+
+import click
+
+from fate_client.flow_cli.utils.lazy_group import LazyGroup
 
 
 CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
 
 config_path = Path(__file__).parent.parent.joinpath("settings.yaml").resolve()
+config_cache_directory = Path.home().joinpath(".fate_client", "flow_settings_cache")
+
+COMMAND_MODULES = ["client", "job", "data", "log", "model", "output", "permission", "provider", "server", "site",
+                   "table", "task", "test"]
+
+_config_cache = dict()
+
+
+def _load_config_file_cache(cache_path, identity):
+    try:
+        if cache_path.stat().st_mode & 0o077:
+            # readable by others, written before the cache was restricted to its owner, rewrite it
+            return None
+        with cache_path.open("r") as fin:
+            cache = json.load(fin)
+        if cache["identity"] == identity:
+            return cache["config"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+
+def _save_config_file_cache(cache_path, identity, config):
+    """
+    The cache holds app_token of settings.yaml, so it is only readable by the current user
+    """
+    try:
+        config_cache_directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as fout:
+            json.dump(dict(identity=identity, config=config), fout, default=str)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def load_config():
+    """
+    Parsed settings.yaml, kept in this process and in a json file of mode 0600 keyed by path, size and mtime
+    of settings.yaml, so a command does not need to import and run the yaml parser unless settings.yaml changed
+    """
+    stat = config_path.stat()
+    identity = f"{config_path}:{stat.st_size}:{stat.st_mtime_ns}"
+    if _config_cache.get("identity") == identity:
+        return _config_cache["config"]
+
+    cache_path = config_cache_directory.joinpath(hashlib.md5(str(config_path).encode("utf-8")).hexdigest() + ".json")
+    config = _load_config_file_cache(cache_path, identity)
+    if config is None:
+        from ruamel import yaml
+        with open(config_path, 'r') as fin:
+            config = yaml.safe_load(fin)
+        _save_config_file_cache(cache_path, identity, config)
 
+    _config_cache["identity"] = identity
+    _config_cache["config"] = config
+    return config
 
-@click.group(short_help='Fate Flow Client', context_settings=CONTEXT_SETTINGS)
+
+class FlowContext(dict):
+    """
+    ctx.obj of flow commands, ctx.obj["client"] is created on first access
+    """
+    def __init__(self, client_params=None, **kwargs):
+        super().__init__(**kwargs)
+        self._client_params = client_params
+
+    def set_client_params(self, client_params):
+        if client_params != self._client_params:
+            self._client_params = client_params
+            self.pop("client", None)
+
+    def __missing__(self, key):
+        if key != "client" or self._client_params is None:
+            raise KeyError(key)
+
+        from fate_client.flow_sdk import FlowClient
+        self["client"] = FlowClient(**self._client_params)
+        return self["client"]
+
+
+@click.group(short_help='Fate Flow Client', context_settings=CONTEXT_SETTINGS, cls=LazyGroup,
+             lazy_subcommands=dict({name: f"fate_client.flow_cli.commands.{name}:{name}" for name in COMMAND_MODULES},
+                                   shell="fate_client.flow_cli.commands.shell:shell",
+                                   batch="fate_client.flow_cli.commands.shell:batch"))
 @click.pass_context
 def flow_cli(ctx):
     '''
     Fate Flow Client
     '''
+    if ctx.obj is None:
+        ctx.obj = FlowContext()
     ctx.ensure_object(dict)
     if ctx.invoked_subcommand == 'init':
         return
 
-    with open(config_path, 'r') as fin:
-        config = yaml.safe_load(fin)
-        flow_config = config['flow_service']
+    flow_config = load_config()['flow_service']
     if not flow_config.get('api_version'):
         raise ValueError('api_version in config is required')
     ctx.obj['api_version'] = flow_config['api_version']
@@ -57,10 +142,15 @@ def flow_cli(ctx):
 
     ctx.obj['initialized'] = (flow_config.get('ip') and flow_config.get('port'))
     if ctx.obj['initialized']:
-        ctx.obj["client"] = FlowClient(
+        client_params = dict(
             ip=flow_config.get('ip'), port=flow_config.get('port'), version=flow_config.get("api_version"),
             app_id=flow_config.get("app_id"), app_token=flow_config.get('app_token')
         )
+        if isinstance(ctx.obj, FlowContext):
+            ctx.obj.set_client_params(client_params)
+        else:
+            from fate_client.flow_sdk import FlowClient
+            ctx.obj["client"] = FlowClient(**client_params)
 
 
 @flow_cli.command('init')
@@ -77,6 +167,8 @@ def initialization(**kwargs):
     \b
     -usage: flow init --ip 127.0.0.1 --port 9380
     """
+    from ruamel import yaml
+    from fate_client.flow_cli.utils.cli_utils import prettify, connect_service
 
     with open(config_path, 'r') as fin:
         config = yaml.safe_load(fin)
@@ -144,20 +236,5 @@ def get_version():
     print(fate_client.__version__)
 
 
-flow_cli.add_command(client.client)
-flow_cli.add_command(job.job)
-flow_cli.add_command(data.data)
-flow_cli.add_command(log.log)
-flow_cli.add_command(model.model)
-flow_cli.add_command(output.output)
-flow_cli.add_command(permission.permission)
-flow_cli.add_command(provider.provider)
-flow_cli.add_command(server.server)
-flow_cli.add_command(site.site)
-flow_cli.add_command(table.table)
-flow_cli.add_command(task.task)
-flow_cli.add_command(test.test)
-
-
 if __name__ == '__main__':
     flow_cli()
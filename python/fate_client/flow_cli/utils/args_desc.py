@@ -51,6 +51,8 @@ TYPES_DESC = "Down types:sync,async"
 # output
 FILTERS_DESC = "Filter conditions"
 OUTPUT_KEY_DESC = "Primary key for output data or model of the task"
+CHUNKED_DESC = "Upload in parts concurrently, rerun to resume a failed upload"
+DATA_FORMAT_DESC = "Format of downloaded data, parquet and feather need pyarrow"
 
 # table
 DISPLAY_DESC = "Whether to return preview data"
@@ -106,3 +108,7 @@ ARBITER_PARTY_ID_DESC = "Site ID of the arbiter"
 CLIENT_PATH_DESC = "Directory or file path on the client"
 TIMEOUT_DESC = "Timeout limit"
 TASK_CORES_DESC = "Task cores"
+
+# batch
+COMMAND_FILE_DESC = "File of flow commands, one per line, either shell words or a json list, '-' reads stdin"
+STOP_ON_ERROR_DESC = "Stop at the first failed command"
@@ -21,7 +21,7 @@ from fate_client.flow_cli.utils.args_desc import CONF_PATH_DESC, LIMIT_DESC, JOB
     NAMESPACE_DESC, DISPLAY_DESC, MODEL_ID_DESC, MODEL_VERSION_DESC, SERVICE_NAME_DESC, SERVER_NAME_DESC, TIMEOUT_DESC, \
     TASK_CORES_DESC, LOG_TYPE_DESC, INSTANCE_ID_DESC, OUTPUT_KEY_DESC, DEVICE_DESC, VERSION_DESC, URI_DESC, METHOD_DESC, \
     PARAMS_DESC, DATA_DESC, PROTOCOL_DESC, PROVIDER_NAME_DESC, HOST_DESC, PORT_DESC, NODES_DESC, TYPES_DESC, \
-    ARBITER_PARTY_ID_DESC
+    ARBITER_PARTY_ID_DESC, DATA_FORMAT_DESC, CHUNKED_DESC, COMMAND_FILE_DESC, STOP_ON_ERROR_DESC
 
 role_ide_list = ["guest", "host", "arbiter", "local"]
 role_choices_list = ["site", "client", "super_client"]
@@ -83,6 +83,9 @@ TASK_CORES = click.option("--task-cores", type=click.INT, default=2,help=TASK_CO
 LOG_TYPE_REQUIRED = click.option("--log-type", type=click.STRING, required=True, help=LOG_TYPE_DESC)
 INSTANCE_ID = click.option("--instance-id", type=click.STRING, help=INSTANCE_ID_DESC)
 OUTPUT_KEY = click.option("--output-key", type=click.STRING, help=OUTPUT_KEY_DESC)
+CHUNKED = click.option("--chunked", is_flag=True, default=False, help=CHUNKED_DESC)
+DATA_FORMAT = click.option("--format", "data_format", type=click.Choice(["csv", "parquet", "feather"]), default="csv",
+                           help=DATA_FORMAT_DESC)
 DEVICE = click.option("--device", type=click.STRING, help=DEVICE_DESC)
 DEVICE_REQUIRED = click.option("--device", type=click.STRING, help=DEVICE_DESC, required=True)
 VERSION = click.option("--version", type=click.STRING, help=VERSION_DESC)
@@ -95,3 +98,6 @@ PROTOCOL = click.option("--protocol", type=click.STRING, help=PROTOCOL_DESC)
 PROVIDER_NAME = click.option("--provider-name", type=click.STRING, help=PROVIDER_NAME_DESC)
 HOST_REQUIRED = click.option("--host", type=click.STRING, help=HOST_DESC)
 PORT_REQUIRED = click.option("--port", type=click.STRING, help=PORT_DESC)
+COMMAND_FILE_REQUIRED = click.option("-f", "--file", "command_file", type=click.File("r"), required=True,
+                                     help=COMMAND_FILE_DESC)
+STOP_ON_ERROR = click.option("--stop-on-error", is_flag=True, default=False, help=STOP_ON_ERROR_DESC)
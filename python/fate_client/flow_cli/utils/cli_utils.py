@@ -19,7 +19,6 @@ import os
 import click
 import requests
 import socket
-from ruamel import yaml
 from functools import wraps
 
 
@@ -47,6 +46,7 @@ def check_abs_path(path):
 
 
 def load_yaml(path):
+    from ruamel import yaml
     with open(path, "r") as fr:
         return yaml.safe_load(fr)
 
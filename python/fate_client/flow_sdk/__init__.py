@@ -13,3 +13,4 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 from ._client import FlowClient
+from ._async_client import AsyncFlowClient
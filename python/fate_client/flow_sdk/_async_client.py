@@ -0,0 +1,94 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import asyncio
+import functools
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+
+from ._client import FlowClient
+from .utils.base_utils import _is_api_endpoint
+
+
+class AsyncFlowAPI(object):
+    """
+    Awaitable view of a BaseFlowAPI group, every public method of the wrapped api becomes a coroutine function
+    with the same signature, e.g. `await client.job.query(job_id=job_id)`
+    """
+    def __init__(self, api, client: "AsyncFlowClient"):
+        self._api = api
+        self._client = client
+
+    def __getattr__(self, name):
+        attr = getattr(self._api, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def _async_call(*args, **kwargs):
+            return await self._client.run_in_executor(attr, *args, **kwargs)
+
+        setattr(self, name, _async_call)
+        return _async_call
+
+
+class AsyncFlowClient(object):
+    """
+    asyncio flavour of FlowClient, requests are sent through one shared keep-alive session whose connection pool
+    is bounded by max_connections, so one event loop can drive many jobs concurrently.
+
+    Usage:
+        async with AsyncFlowClient(ip, port, max_connections=32) as client:
+            responses = await asyncio.gather(*[client.job.query(job_id=job_id) for job_id in job_ids])
+    """
+    def __init__(self, ip="127.0.0.1", port=9380, version="v2", app_id=None, app_token=None, user_name="",
+                 max_connections=10, resilience_policy=None, signer=None):
+        self._client = FlowClient(ip=ip, port=port, version=version,
+                                  app_id=app_id, app_token=app_token, user_name=user_name,
+                                  resilience_policy=resilience_policy, signer=signer)
+        self._client.set_connection_pool(max_connections)
+        self._executor = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix="async_flow_client")
+
+        for name, api in inspect.getmembers(self._client, _is_api_endpoint):
+            setattr(self, name, AsyncFlowAPI(api, self))
+
+    @property
+    def sync_client(self) -> FlowClient:
+        return self._client
+
+    async def run_in_executor(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def get(self, uri, **kwargs):
+        return await self.run_in_executor(self._client.get, uri, **kwargs)
+
+    async def post(self, uri, **kwargs):
+        return await self.run_in_executor(self._client.post, uri, **kwargs)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self._client._http.close()
+
+    async def aclose(self):
+        """
+        close() without blocking the event loop, in-flight requests are awaited in the default executor
+        """
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
@@ -31,6 +31,8 @@ class FlowClient(BaseFlowClient):
     table = Table()
     test = Test()
 
-    def __init__(self, ip="127.0.0.1", port=9380, version="v2", app_id=None, app_token=None, user_name=""):
-        super().__init__(ip, port, version, app_id=app_id, app_token=app_token, user_name=user_name)
+    def __init__(self, ip="127.0.0.1", port=9380, version="v2", app_id=None, app_token=None, user_name="",
+                 resilience_policy=None, signer=None):
+        super().__init__(ip, port, version, app_id=app_id, app_token=app_token, user_name=user_name,
+                         resilience_policy=resilience_policy, signer=signer)
         self.API_BASE_URL = 'http://%s:%s/%s' % (ip, port, version)
@@ -15,9 +15,13 @@
 #
 import os
 import json
+import tempfile
+from typing import Callable
 from ..utils.base_utils import BaseFlowAPI
 from ..utils.params_utils import filter_invalid_params
-from ..utils.io_utils import download_from_request
+from ..utils.chunked_upload import ChunkedUploader, ChunkedUploadError, DEFAULT_CONCURRENCY, DEFAULT_PART_SIZE, \
+    split_file_by_sample_id
+from ..utils.io_utils import build_multipart_upload, download_from_request, gzip_to_temp_file
 
 
 class Data(BaseFlowAPI):
@@ -47,9 +51,10 @@ class Data(BaseFlowAPI):
         return self._post(url='/data/component/upload', json=params)
 
     def upload_file(self, file: str, head: bool, partitions: int, meta: dict, namespace: str = None, name: str = None,
-                    extend_sid: bool = None, role: str = None, party_id: str = None):
+                    extend_sid: bool = None, role: str = None, party_id: str = None,
+                    progress_callback: Callable[[int, int], None] = None, compress: bool = False):
         """
-       upload file
+       upload file, the file is streamed to the server in chunks instead of being loaded into memory
 
         Args:
             file: file, such as: "/data/xxx.csv"
@@ -61,18 +66,112 @@ class Data(BaseFlowAPI):
             meta: meta
             role: role, such as: "guest", "host".
             party_id: party id.
+            progress_callback: called with (sent_bytes, total_bytes) while uploading.
+            compress: gzip the file before sending, the server should accept gzip encoded files.
 
         Returns:
             {'code': 0, 'message': 'success','data':{...}]}
         """
         kwargs = locals()
+        kwargs.pop("progress_callback")
+        kwargs.pop("compress")
         params = filter_invalid_params(**kwargs)
         file_path = params.pop("file")
-        files = {'file': open(file_path, 'rb')}
         meta = params.pop("meta")
         params["meta"] = json.dumps(meta)
 
-        return self._post(url='/data/component/upload/file', files=files, data=params, handle_result=True)
+        file_name = os.path.basename(file_path)
+        if compress:
+            fileobj = gzip_to_temp_file(file_path)
+            file_name, content_type = f"{file_name}.gz", "application/gzip"
+        else:
+            fileobj = open(file_path, "rb")
+            content_type = None
+
+        with fileobj:
+            body, headers = build_multipart_upload(params, "file", file_name, fileobj, content_type=content_type,
+                                                   progress_callback=progress_callback)
+            return self._post(url='/data/component/upload/file', data=body, headers=headers, handle_result=True)
+
+    def upload_file_chunked(self, file: str, head: bool, partitions: int, meta: dict, namespace: str = None,
+                            name: str = None, extend_sid: bool = None, role: str = None, party_id: str = None,
+                            part_size: int = DEFAULT_PART_SIZE, concurrency: int = DEFAULT_CONCURRENCY,
+                            progress_callback: Callable[[int, int], None] = None):
+        """
+        upload file in fixed-size parts sent concurrently, calling it again after a failure resumes from
+        the parts already acknowledged by the server
+
+        Args:
+            file: file, such as: "/data/xxx.csv"
+            head: bool
+            namespace: namespace
+            name: name
+            partitions: num
+            extend_sid: bool
+            meta: meta
+            role: role, such as: "guest", "host".
+            party_id: party id.
+            part_size: bytes of each part
+            concurrency: parts uploaded at the same time
+            progress_callback: called with (sent_bytes, total_bytes) while uploading.
+
+        Returns:
+            {'code': 0, 'message': 'success','data':{...}]}
+        """
+        kwargs = locals()
+        for key in ["part_size", "concurrency", "progress_callback"]:
+            kwargs.pop(key)
+        params = filter_invalid_params(**kwargs)
+        file_path = params.pop("file")
+
+        uploader = ChunkedUploader(self, part_size=part_size, concurrency=concurrency,
+                                   progress_callback=progress_callback)
+        try:
+            return uploader.upload(file_path, **params)
+        except ChunkedUploadError as e:
+            return e.response if isinstance(e.response, dict) else {"code": 100, "message": str(e)}
+
+    def upload_file_partitioned(self, file: str, head: bool, partitions: int, meta: dict, namespace: str = None,
+                                name: str = None, extend_sid: bool = None, role: str = None, party_id: str = None,
+                                concurrency: int = None, progress_callback: Callable[[int, int], None] = None):
+        """
+        split file on the client into partitions by crc32 of sample id, then upload the partitions in parallel,
+        one part of the chunked upload protocol per partition, the server keeps part i as partition i of the table
+
+        Args:
+            file: file, such as: "/data/xxx.csv"
+            head: bool
+            namespace: namespace
+            name: name
+            partitions: num
+            extend_sid: bool
+            meta: meta, sample id column is meta["match_id_name"] or meta["sample_id_name"], the first column
+                if neither is given; delimiter is meta["delimiter"], default ","
+            role: role, such as: "guest", "host".
+            party_id: party id.
+            concurrency: partitions uploaded at the same time, default is partitions
+            progress_callback: called with (sent_bytes, total_bytes) while uploading.
+
+        Returns:
+            {'code': 0, 'message': 'success','data':{...}]}
+        """
+        kwargs = locals()
+        for key in ["concurrency", "progress_callback"]:
+            kwargs.pop(key)
+        params = filter_invalid_params(**kwargs)
+        file_path = params.pop("file")
+        meta = meta or {}
+        id_column = meta.get("match_id_name") or meta.get("sample_id_name")
+
+        uploader = ChunkedUploader(self, concurrency=concurrency or partitions, progress_callback=progress_callback)
+        with tempfile.TemporaryDirectory() as partition_dir:
+            partition_paths = split_file_by_sample_id(file_path, partitions, partition_dir, head=head,
+                                                      delimiter=meta.get("delimiter", ","),
+                                                      id_column=id_column if head else None)
+            try:
+                return uploader.upload_partitions(file_path, partition_paths, **params)
+            except ChunkedUploadError as e:
+                return e.response if isinstance(e.response, dict) else {"code": 100, "message": str(e)}
 
     def dataframe_transformer(self, namespace: str, name: str, data_warehouse: dict, drop: bool = True,
                               site_name: str = None):
@@ -91,21 +190,25 @@ class Data(BaseFlowAPI):
         params = filter_invalid_params(**kwargs)
         return self._post(url='/data/component/dataframe/transformer', json=params)
 
-    def download(self, namespace: str = None, name: str = None, path: str = None):
+    def download(self, namespace: str = None, name: str = None, path: str = None,
+                 progress_callback: Callable[[int, int], None] = None):
         """
         download data
 
         Args:
             namespace: namespace
             name: name
+            path: download path
+            progress_callback: called with (downloaded_bytes, total_bytes) while downloading.
 
         Returns:
             {'code': 0, 'message': 'success','data':{...}]}
         """
         kwargs = locals()
+        kwargs.pop("progress_callback")
         params = filter_invalid_params(**kwargs)
-        resp = self._get(url='/data/download', params=params, handle_result=False)
-        return download_from_request(resp, path)
+        resp = self._get(url='/data/download', params=params, handle_result=False, stream=True)
+        return download_from_request(resp, path, progress_callback=progress_callback)
 
     def download_component(self, namespace: str = None, name: str = None, path: str = None):
         """
@@ -147,7 +147,7 @@ class Job(BaseFlowAPI):
         kwargs = locals()
         _path = kwargs.pop("path", None)
         data = filter_invalid_params(**kwargs)
-        resp = self._post(url='/job/log/download', handle_result=False, json=data)
+        resp = self._post(url='/job/log/download', handle_result=False, json=data, stream=True)
         extract_dir = os.path.join(_path, f'{job_id}_logs')
         if _path:
             # download to local dir
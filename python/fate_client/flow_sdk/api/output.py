@@ -14,6 +14,7 @@
 #  limitations under the License.
 #
 import os
+from typing import Callable
 
 from ..utils.base_utils import BaseFlowAPI
 from ..utils.params_utils import filter_invalid_params
@@ -88,7 +89,8 @@ class Output(BaseFlowAPI):
         params = filter_invalid_params(**kwargs)
         return self._get(url='/output/model/query', params=params)
 
-    def download_model(self, job_id: str, role: str, party_id: str, task_name: str, path: str = None):
+    def download_model(self, job_id: str, role: str, party_id: str, task_name: str, path: str = None,
+                       progress_callback: Callable[[int, int], None] = None):
         """
         download model
         Args:
@@ -97,16 +99,18 @@ class Output(BaseFlowAPI):
             party_id: party id.
             task_name: task name.
             path: path, such as: /data/projects/xxx
+            progress_callback: called with (downloaded_bytes, total_bytes) while downloading to path.
 
         Returns:
         {'code': 0, 'message': 'success','data':{}}
         """
         kwargs = locals()
+        kwargs.pop("progress_callback")
         params = filter_invalid_params(**kwargs)
-        resp = self._get(url='/output/model/download', params=params, handle_result=False)
+        resp = self._get(url='/output/model/download', params=params, handle_result=False, stream=True)
         if path:
             extract_dir = os.path.join(path, f'output_model_{job_id}_{role}_{party_id}_{task_name}')
-            return download_from_request(resp, extract_dir)
+            return download_from_request(resp, extract_dir, progress_callback=progress_callback)
         else:
             return resp
 
@@ -127,7 +131,8 @@ class Output(BaseFlowAPI):
         return self._post(url='/output/model/delete', json=params)
 
     def download_data(
-            self, job_id: str, role: str, party_id: str, task_name: str, output_key: str = None, path: str = None
+            self, job_id: str, role: str, party_id: str, task_name: str, output_key: str = None, path: str = None,
+            progress_callback: Callable[[int, int], None] = None
     ):
         """
         download data
@@ -138,17 +143,19 @@ class Output(BaseFlowAPI):
             task_name: task name.
             output_key: output key.
             path: download path, such as: /data/projects/xxx.
+            progress_callback: called with (downloaded_bytes, total_bytes) while downloading to path.
 
         Returns:
             If "download_dir" is passed, json will be returned, eg: {'code': 0, 'message': 'download success, please check the path'}
             else return tar.gz stream
         """
         kwargs = locals()
+        kwargs.pop("progress_callback")
         params = filter_invalid_params(**kwargs)
-        resp = self._get(url='/output/data/download', params=params, handle_result=False)
+        resp = self._get(url='/output/data/download', params=params, handle_result=False, stream=True)
         if path:
             extract_dir = os.path.join(path, f'output_data_{job_id}_{role}_{party_id}_{task_name}')
-            return download_from_request(resp, extract_dir)
+            return download_from_request(resp, extract_dir, progress_callback=progress_callback)
         else:
             return resp
 
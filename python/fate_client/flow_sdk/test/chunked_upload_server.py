@@ -0,0 +1,163 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""
+Stand-in server of the chunked upload protocol (see flow_sdk.utils.chunked_upload), parts are kept in a local
+directory and concatenated on complete, or kept as partition files of a table directory for partitioned uploads.
+Run it with
+    python chunked_upload_server.py --port 9380 --directory /tmp/chunked_upload
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+import uuid
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+API_VERSION = "v2"
+
+
+class ChunkedUploadStore(object):
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.uploads = dict()
+        self.fail_parts = set()
+        self.part_requests = 0
+        self.lock = threading.Lock()
+
+    def init(self, params):
+        with self.lock:
+            upload_id = params.get("upload_id")
+            if upload_id not in self.uploads:
+                upload_id = uuid.uuid1().hex
+                self.uploads[upload_id] = dict(params=params, parts=dict())
+                self.directory.joinpath(upload_id).mkdir(parents=True, exist_ok=True)
+            return dict(upload_id=upload_id, parts=sorted(self.uploads[upload_id]["parts"]))
+
+    def put_part(self, upload_id, part_number, md5, content):
+        with self.lock:
+            self.part_requests += 1
+            if part_number in self.fail_parts:
+                self.fail_parts.discard(part_number)
+                raise ValueError(f"injected failure of part {part_number}")
+            if upload_id not in self.uploads:
+                raise ValueError(f"upload {upload_id} not found")
+        if hashlib.md5(content).hexdigest() != md5:
+            raise ValueError(f"md5 of part {part_number} mismatch")
+
+        with self.directory.joinpath(upload_id, str(part_number)).open("wb") as fout:
+            fout.write(content)
+        with self.lock:
+            self.uploads[upload_id]["parts"][part_number] = md5
+        return dict(part_number=part_number, md5=md5)
+
+    def complete(self, upload_id, part_count, md5s):
+        upload = self.uploads.get(upload_id)
+        if upload is None:
+            raise ValueError(f"upload {upload_id} not found")
+        if [upload["parts"].get(part_number) for part_number in range(part_count)] != md5s:
+            raise ValueError("parts are incomplete")
+
+        if upload["params"].get("partitioned"):
+            path = self.directory.joinpath(upload_id, "table")
+            path.mkdir()
+            for part_number in range(part_count):
+                os.replace(self.directory.joinpath(upload_id, str(part_number)),
+                           path.joinpath(f"partition_{part_number}"))
+            return dict(path=str(path), partitions=part_count, namespace=upload["params"].get("namespace"),
+                        name=upload["params"].get("name"))
+
+        path = self.directory.joinpath(upload_id, upload["params"]["file_name"])
+        with path.open("wb") as fout:
+            for part_number in range(part_count):
+                part_path = self.directory.joinpath(upload_id, str(part_number))
+                fout.write(part_path.read_bytes())
+                part_path.unlink()
+        return dict(path=str(path), namespace=upload["params"].get("namespace"), name=upload["params"].get("name"))
+
+
+class ChunkedUploadHandler(BaseHTTPRequestHandler):
+    store: ChunkedUploadStore = None
+
+    def _send(self, body):
+        buf = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(buf)))
+        self.end_headers()
+        self.wfile.write(buf)
+
+    def _read_multipart(self, body):
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode("utf-8") + body)
+        fields = dict()
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            fields[name] = part.get_payload(decode=True)
+        return fields
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        uri = self.path.split("?")[0][len(f"/{API_VERSION}"):]
+        try:
+            if uri == "/data/component/upload/chunked/init":
+                data = self.store.init(json.loads(body))
+            elif uri == "/data/component/upload/chunked/part":
+                fields = self._read_multipart(body)
+                data = self.store.put_part(fields["upload_id"].decode(), int(fields["part_number"]),
+                                           fields["md5"].decode(), fields["file"])
+            elif uri == "/data/component/upload/chunked/complete":
+                params = json.loads(body)
+                data = self.store.complete(params["upload_id"], params["part_count"], params["md5s"])
+                self._send(dict(code=0, message="success", job_id=uuid.uuid1().hex, data=data))
+                return
+            else:
+                self._send(dict(code=404, message=f"{uri} not found"))
+                return
+        except (ValueError, KeyError) as e:
+            self._send(dict(code=100, message=str(e)))
+            return
+
+        self._send(dict(code=0, message="success", data=data))
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(directory, host="127.0.0.1", port=0):
+    """
+    Returns:
+        (server, store), server is serving in a daemon thread, call server.shutdown() to stop it
+    """
+    store = ChunkedUploadStore(directory)
+    handler = type("Handler", (ChunkedUploadHandler, ), dict(store=store))
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, store
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stand-in server of chunked upload")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9380)
+    parser.add_argument("--directory", default=os.path.join(os.getcwd(), "chunked_upload"))
+    args = parser.parse_args()
+
+    store = ChunkedUploadStore(args.directory)
+    handler = type("Handler", (ChunkedUploadHandler, ), dict(store=store))
+    ThreadingHTTPServer((args.host, args.port), handler).serve_forever()
@@ -0,0 +1,88 @@
+import csv
+import hashlib
+import os
+import tempfile
+import zlib
+
+from fate_client.flow_sdk import FlowClient
+from fate_client.flow_sdk.test.chunked_upload_server import start_server
+from fate_client.flow_sdk.utils.chunked_upload import ChunkedUploader
+
+
+def md5sum(path):
+    with open(path, "rb") as fin:
+        return hashlib.md5(fin.read()).hexdigest()
+
+
+def read_rows(path):
+    with open(path, "r", newline="") as fin:
+        return list(csv.reader(fin))
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as work_dir:
+        server, store = start_server(os.path.join(work_dir, "server"))
+        client = FlowClient(ip="127.0.0.1", port=server.server_port)
+
+        file_path = os.path.join(work_dir, "data.csv")
+        with open(file_path, "wb") as fout:
+            fout.write(b"id,x0,x1\n")
+            for i in range(100000):
+                fout.write(f"{i},{i * 0.1},{i * 0.2}\n".encode("utf-8"))
+
+        part_size = 256 * 1024
+        part_count = (os.path.getsize(file_path) + part_size - 1) // part_size
+        state_directory = os.path.join(work_dir, "state")
+        upload_params = dict(head=True, partitions=4, meta={"delimiter": ","}, namespace="experiment", name="data")
+
+        store.fail_parts = {3}
+        uploader = ChunkedUploader(client.data, part_size=part_size, concurrency=4, retries=0,
+                                   state_directory=state_directory)
+        try:
+            uploader.upload(file_path, **upload_params)
+            raise AssertionError("first upload should fail")
+        except Exception as e:
+            print(f"first upload failed as expected: {e}")
+
+        uploaded_parts = len(next(iter(store.uploads.values()))["parts"])
+        assert 0 < uploaded_parts < part_count, uploaded_parts
+
+        requests_before_resume = store.part_requests
+        progress = []
+        uploader = ChunkedUploader(client.data, part_size=part_size, concurrency=4,
+                                   state_directory=state_directory,
+                                   progress_callback=lambda sent, total: progress.append((sent, total)))
+        response = uploader.upload(file_path, **upload_params)
+        assert response["code"] == 0, response
+        assert store.part_requests - requests_before_resume == part_count - uploaded_parts
+        assert progress[-1] == (os.path.getsize(file_path), os.path.getsize(file_path)), progress[-1]
+        assert md5sum(response["data"]["path"]) == md5sum(file_path)
+        assert not os.listdir(state_directory)
+        print(f"resumed upload sent {part_count - uploaded_parts} of {part_count} parts")
+
+        response = client.data.upload_file_chunked(file=file_path, part_size=part_size, **upload_params)
+        assert response["code"] == 0, response
+        assert md5sum(response["data"]["path"]) == md5sum(file_path)
+
+        quoted_path = os.path.join(work_dir, "quoted.csv")
+        with open(quoted_path, "w", newline="") as fout:
+            writer = csv.writer(fout)
+            writer.writerow(["x0", "id", "note"])
+            for i in range(1000):
+                writer.writerow([i * 0.1, f"id_{i}", f"a, b\nline {i}" if i % 7 == 0 else "plain"])
+
+        partitioned_params = dict(upload_params, meta={"delimiter": ",", "match_id_name": "id"})
+        response = client.data.upload_file_partitioned(file=quoted_path, **partitioned_params)
+        assert response["code"] == 0, response
+        origin_rows = read_rows(quoted_path)
+        partition_rows = []
+        for partition_id in range(upload_params["partitions"]):
+            rows = read_rows(os.path.join(response["data"]["path"], f"partition_{partition_id}"))
+            assert rows[0] == origin_rows[0]
+            assert all(zlib.crc32(row[1].encode("utf-8")) % upload_params["partitions"] == partition_id
+                       for row in rows[1:])
+            partition_rows.extend(rows[1:])
+        assert sorted(partition_rows) == sorted(origin_rows[1:])
+        print("partitioned upload kept as partitions by sample id, quoted fields intact")
+
+        server.shutdown()
@@ -0,0 +1,92 @@
+import json
+import re
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fate_client.flow_sdk import FlowClient
+from fate_client.flow_sdk.utils.instrumentation import Histogram, RequestMetrics, start_metrics_server
+
+SAMPLE_LINE = re.compile(r'^[a-z_]+(\{[a-z_]+="[^"]*"(,[a-z_]+="[^"]*")*\})? [0-9.e+-]+$')
+
+
+class JsonHandler(BaseHTTPRequestHandler):
+    def _reply(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        buf = json.dumps(dict(code=0, message="success", data=[])).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(buf)))
+        self.end_headers()
+        self.wfile.write(buf)
+
+    do_GET = _reply
+    do_POST = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), JsonHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    histogram = Histogram([1, 5, 10])
+    for value in [0.5, 1, 3, 5, 7, 10, 20]:
+        histogram.observe(value)
+    assert histogram.counts == [2, 2, 2, 1], histogram.counts
+    assert histogram.cumulative_counts() == [2, 4, 6, 7]
+    assert histogram.count == 7 and histogram.sum == 46.5
+    print("histogram buckets are cumulative and le-inclusive")
+
+    server = start_server()
+    client = FlowClient(ip="127.0.0.1", port=server.server_port)
+    metrics = RequestMetrics(latency_buckets=(0.5, 60), size_buckets=(1 << 20, ))
+    client.add_request_hook(metrics)
+    for _ in range(3):
+        assert client.job.query_job_list()["code"] == 0
+    client.remove_request_hook(metrics)
+    assert client.job.query_job_list()["code"] == 0
+
+    snapshot = metrics.snapshot()
+    assert list(snapshot) == ["GET /job/list/query"], snapshot
+    endpoint = snapshot["GET /job/list/query"]
+    assert endpoint["count"] == 3 and endpoint["status_codes"] == {"200": 3}, endpoint
+    assert endpoint["latency_buckets"]["+Inf"] == 3 and endpoint["latency_buckets"][60] == 3, endpoint
+    assert endpoint["response_bytes_sum"] > 0 and endpoint["retries"] == 0 and endpoint["errors"] == 0
+    print("hook recorded 3 requests, none after it was removed")
+
+    text = metrics.prometheus_text()
+    assert text.endswith("\n")
+    for line in text.splitlines():
+        assert line.startswith("# HELP ") or line.startswith("# TYPE ") or SAMPLE_LINE.match(line), line
+    labels = 'method="GET",endpoint="/job/list/query"'
+    for expected in ["# TYPE fate_flow_client_request_latency_seconds histogram",
+                     f'fate_flow_client_request_latency_seconds_bucket{{{labels},le="+Inf"}} 3',
+                     f"fate_flow_client_request_latency_seconds_count{{{labels}}} 3",
+                     f'fate_flow_client_request_size_bytes_bucket{{{labels},le="1048576"}} 3',
+                     "# TYPE fate_flow_client_responses_total counter",
+                     f'fate_flow_client_responses_total{{{labels},status="200"}} 3',
+                     f"fate_flow_client_retries_total{{{labels}}} 0"]:
+        assert expected in text.splitlines(), expected
+    print("prometheus text follows the exposition format")
+
+    metrics_server = start_metrics_server(metrics, port=0)
+    host, port = metrics_server.server_address[:2]
+    assert host == "127.0.0.1", host
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+        assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert response.read().decode("utf-8") == text
+    try:
+        urllib.request.urlopen(f"http://127.0.0.1:{port}/other")
+        raise AssertionError("only /metrics should be served")
+    except urllib.error.HTTPError as e:
+        assert e.code == 404
+    print("metrics served on localhost at /metrics")
+
+    metrics_server.shutdown()
+    server.shutdown()
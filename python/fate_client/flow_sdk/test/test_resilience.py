@@ -0,0 +1,94 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fate_client.flow_sdk import FlowClient
+from fate_client.flow_sdk.utils.resilience import CircuitBreaker, ResiliencePolicy
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    unavailable = 0
+    delay = 0
+    requests = 0
+
+    def _reply(self):
+        FlakyHandler.requests += 1
+        if FlakyHandler.unavailable > 0:
+            FlakyHandler.unavailable -= 1
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        time.sleep(FlakyHandler.delay)
+        buf = json.dumps(dict(code=0, message="success")).encode("utf-8")
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(buf)))
+            self.end_headers()
+            self.wfile.write(buf)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    do_GET = _reply
+    do_POST = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    server = start_server()
+    policy = ResiliencePolicy(connect_timeout=1, read_timeout=5, endpoint_timeouts={"/job/query": (1, 0.2)},
+                              max_retries=2, backoff_base=0.01, failure_threshold=3, reset_timeout=0.5)
+    client = FlowClient(ip="127.0.0.1", port=server.server_port, resilience_policy=policy)
+
+    FlakyHandler.unavailable = 2
+    assert client.job.query_job_list()["code"] == 0
+    assert client.resilience_stats["retries"] == 2, client.resilience_stats
+    print("GET retried through two 503 responses")
+
+    FlakyHandler.unavailable, FlakyHandler.requests = 1, 0
+    try:
+        client.job.submit(dag_schema={})
+    except ValueError:
+        pass
+    assert FlakyHandler.requests == 1, FlakyHandler.requests
+    assert client.job.query_job_list()["code"] == 0
+    print("POST is not retried")
+
+    FlakyHandler.delay = 0.5
+    start = time.time()
+    response = client.job.query(job_id="slow")
+    assert response["code"] == 100 and time.time() - start < 2, response
+    assert client.resilience_stats["timeouts"] == 3, client.resilience_stats
+    assert policy.circuit_breaker.state == CircuitBreaker.OPEN
+    FlakyHandler.delay = 0
+    print("per endpoint read timeout applied and circuit opened")
+
+    FlakyHandler.requests = 0
+    response = client.job.query_job_list()
+    assert response["code"] == 100 and "circuit breaker" in response["retmsg"], response
+    assert FlakyHandler.requests == 0
+    print(f"failed fast: {response['retmsg']}")
+
+    time.sleep(0.6)
+    assert client.job.query_job_list()["code"] == 0
+    assert policy.circuit_breaker.state == CircuitBreaker.CLOSED
+    print(f"circuit closed after reset timeout, stats={client.resilience_stats}")
+
+    server.shutdown()
+    server.server_close()
+
+    refused_client = FlowClient(ip="127.0.0.1", port=server.server_port, resilience_policy=ResiliencePolicy())
+    start = time.time()
+    assert refused_client.job.query_job_list()["code"] == 100
+    assert refused_client.resilience_stats["retries"] == 0 and time.time() - start < 0.5
+    print("refused connection failed fast without retries")
@@ -13,15 +13,18 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 #
-import hashlib
 import inspect
 import json
-import random
 import sys
 import time
 import traceback
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from .instrumentation import RequestTrace
+from .resilience import CircuitOpenError, ResiliencePolicy, RETRY_STATUS_CODES
+from .signer import Md5Signer
 
 
 def _is_api_endpoint(obj):
@@ -31,17 +34,22 @@ def _is_api_endpoint(obj):
 class BaseFlowClient:
     API_BASE_URL = ''
 
+    _api_endpoints = dict()
+
     def __new__(cls, *args, **kwargs):
         self = super().__new__(cls)
-        api_endpoints = inspect.getmembers(self, _is_api_endpoint)
-        for name, api in api_endpoints:
-            api_cls = type(api)
-            api = api_cls(self)
-            setattr(self, name, api)
+        if cls not in BaseFlowClient._api_endpoints:
+            BaseFlowClient._api_endpoints[cls] = [(name, type(api))
+                                                  for name, api in inspect.getmembers(cls, _is_api_endpoint)]
+        for name, api_cls in BaseFlowClient._api_endpoints[cls]:
+            setattr(self, name, api_cls(self))
         return self
 
-    def __init__(self, ip, port, version, app_id=None, app_token=None, user_name=""):
+    def __init__(self, ip, port, version, app_id=None, app_token=None, user_name="", resilience_policy=None,
+                 signer=None):
         self._http = requests.Session()
+        self._resilience_policy = resilience_policy if resilience_policy is not None else ResiliencePolicy()
+        self._request_hooks = []
         self.ip = ip
         self.port = port
         self.version = version
@@ -49,27 +57,115 @@ class BaseFlowClient:
         self.app_id = app_id if app_id and app_id else None
         self.app_token = app_token if app_token and app_token else None
         self.user_name = user_name
+        self._signer = signer
+        self._default_signer = None
+
+    def set_connection_pool(self, pool_size, block=True):
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=block)
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
+
+    def set_signer(self, signer):
+        """
+        Args:
+            signer: utils.signer.Signer, e.g. HmacSha256Signer(app_id, app_token, user_name),
+                None to sign with md5 using app_id and app_token of the client
+        """
+        self._signer = signer
+
+    def set_resilience_policy(self, resilience_policy: ResiliencePolicy):
+        self._resilience_policy = resilience_policy
+
+    @property
+    def resilience_stats(self):
+        """
+        counters of requests, retries, failures, timeouts, circuit_rejections and circuit_opens
+        """
+        return self._resilience_policy.stats.dict()
+
+    def add_request_hook(self, hook):
+        """
+        Args:
+            hook: callable, called with a utils.instrumentation.RequestRecord after every request,
+                e.g. utils.instrumentation.RequestMetrics()
+        """
+        self._request_hooks.append(hook)
+
+    def remove_request_hook(self, hook):
+        self._request_hooks.remove(hook)
 
     def _request(self, method, uri, **kwargs):
+        if not self._request_hooks:
+            return self._send(method, uri, **kwargs)
+
+        trace = RequestTrace(method, uri)
+        response = self._send(method, uri, trace=trace, **kwargs)
+        record = trace.finish(response)
+        for hook in self._request_hooks:
+            hook(record)
+        return response
+
+    def _send(self, method, uri, trace=None, **kwargs):
         stream = kwargs.pop('stream', self._http.stream)
-        prepped = requests.Request(method, self.API_BASE_URL + uri, **kwargs).prepare()
+        policy = self._resilience_policy
+        timeout = kwargs.pop('timeout', None) or policy.get_timeout(uri)
+        retries = policy.get_retries(method)
+
+        for attempt in range(retries + 1):
+            prepped = requests.Request(method, self.API_BASE_URL + uri, **kwargs).prepare()
+
+            signature_headers = self._signature_headers
+            if signature_headers:
+                prepped.headers.update(signature_headers)
+
+            if trace is not None:
+                trace.on_attempt(prepped)
+
+            try:
+                policy.before_request()
+            except CircuitOpenError as e:
+                return {
+                    'code': 100,
+                    'retmsg': f'{e}, fate flow service seems unavailable, request {uri} is not sent',
+                }
+
+            try:
+                response = self._http.send(prepped, stream=stream, timeout=timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                policy.record_failure(timeout=isinstance(e, requests.exceptions.Timeout))
+                if attempt < retries and policy.should_retry(e):
+                    policy.stats.incr("retries")
+                    time.sleep(policy.get_backoff(attempt))
+                    continue
+                return self._exception_response(e)
+            except Exception as e:
+                policy.record_failure()
+                return self._exception_response(e)
+
+            if response.status_code in RETRY_STATUS_CODES:
+                policy.record_failure()
+                if attempt < retries:
+                    response.close()
+                    policy.stats.incr("retries")
+                    time.sleep(policy.get_backoff(attempt))
+                    continue
+            else:
+                policy.record_success()
 
-        if self._signature_headers:
-            prepped.headers.update(self._signature_headers)
+            return response
 
-        try:
-            response = self._http.send(prepped, stream=stream)
-        except Exception as e:
-            response = {
-                'code': 100,
-                'retmsg': str(e),
-            }
-
-            if 'connection refused' in response['retmsg'].lower():
-                response['retmsg'] = 'Connection refused, Please check if the fate flow service is started'
-            else:
-                exc_type, exc_value, exc_traceback_obj = sys.exc_info()
-                response['traceback'] = traceback.format_exception(exc_type, exc_value, exc_traceback_obj)
+    @staticmethod
+    def _exception_response(e):
+        response = {
+            'code': 100,
+            'retmsg': str(e),
+        }
+
+        if 'connection refused' in response['retmsg'].lower():
+            response['retmsg'] = 'Connection refused, Please check if the fate flow service is started'
+        else:
+            exc_type, exc_value, exc_traceback_obj = sys.exc_info()
+            response['traceback'] = traceback.format_exception(exc_type, exc_value, exc_traceback_obj)
 
         return response
 
@@ -90,26 +186,27 @@ class BaseFlowClient:
         else:
             return self._decode_result(response)
 
+    def _get_signer(self):
+        if self._signer is not None:
+            return self._signer
+        if not (self.app_id and self.app_token):
+            return None
+
+        signer = self._default_signer
+        if signer is None or (signer.app_id, signer.app_token, signer.user_name) != \
+                (self.app_id, self.app_token, self.user_name):
+            signer = self._default_signer = Md5Signer(self.app_id, self.app_token, self.user_name)
+        return signer
+
     @property
     def _signature_headers(self):
-        if self.app_id and self.app_token:
-            nonce, timestamp, sign = self.generate_signature_params()
-            return {
-                "appId": self.app_id,
-                "userName": self.user_name,
-                "Nonce": nonce,
-                "Timestamp": timestamp,
-                "Signature": sign
-            }
-        else:
+        signer = self._get_signer()
+        if signer is None:
             return {}
+        return signer.headers()
 
     def generate_signature_params(self):
-        nonce = str(random.randint(1000, 9999))
-        timestamp = str(int(time.time())*1000)
-        temp = hashlib.md5(str(self.app_id + self.user_name + nonce + timestamp).encode("utf8")).hexdigest().lower()
-        sign = hashlib.md5(str(temp + self.app_token).encode("utf8")).hexdigest().lower()
-        return nonce, timestamp, sign
+        return self._get_signer().generate_signature_params()
 
     def get(self, uri, **kwargs):
         return self._request(method='get', uri=uri, **kwargs)
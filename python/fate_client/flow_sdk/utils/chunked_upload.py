@@ -0,0 +1,282 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import csv
+import hashlib
+import json
+import os
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from .io_utils import UPLOAD_CHUNK_SIZE, build_multipart_upload
+
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+DEFAULT_CONCURRENCY = 4
+DEFAULT_PART_RETRIES = 3
+DEFAULT_STATE_DIRECTORY = str(Path.home().joinpath(".fate_client", "upload_state"))
+
+CHUNKED_UPLOAD_INIT_URL = "/data/component/upload/chunked/init"
+CHUNKED_UPLOAD_PART_URL = "/data/component/upload/chunked/part"
+CHUNKED_UPLOAD_COMPLETE_URL = "/data/component/upload/chunked/complete"
+
+
+class ChunkedUploadError(Exception):
+    def __init__(self, message, response=None):
+        super().__init__(message)
+        self.response = response
+
+
+class UploadState(object):
+    """
+    Acknowledged parts of an upload persisted as json, keyed by file path, size, mtime and upload target, so a
+    rerun of the same upload continues from where it failed
+    """
+    def __init__(self, state_directory, file_path, part_size, params):
+        stat = os.stat(file_path)
+        identity = json.dumps(dict(path=os.path.abspath(file_path), size=stat.st_size, mtime=stat.st_mtime_ns,
+                                   part_size=part_size, params=params), sort_keys=True, default=str)
+        self._path = Path(state_directory).joinpath(hashlib.sha256(identity.encode("utf-8")).hexdigest() + ".json")
+        self._lock = threading.Lock()
+        self.upload_id = None
+        self.parts = dict()
+
+        if self._path.exists():
+            try:
+                with self._path.open("r") as fin:
+                    state = json.load(fin)
+                self.upload_id = state["upload_id"]
+                self.parts = {int(part_number): md5 for part_number, md5 in state["parts"].items()}
+            except (OSError, ValueError, KeyError):
+                self.upload_id, self.parts = None, dict()
+
+    def reset(self, upload_id):
+        with self._lock:
+            self.upload_id = upload_id
+            self.parts = dict()
+            self._save()
+
+    def ack(self, part_number, md5):
+        with self._lock:
+            self.parts[part_number] = md5
+            self._save()
+
+    def _save(self):
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_suffix(f".{threading.get_ident()}.tmp")
+        with tmp_path.open("w") as fout:
+            json.dump(dict(upload_id=self.upload_id, parts=self.parts), fout)
+        os.replace(tmp_path, self._path)
+
+    def remove(self):
+        try:
+            self._path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class ChunkedUploader(object):
+    """
+    Upload a file as fixed-size parts, each part carries its md5 and is sent by a pool of threads.
+    Acknowledged parts are recorded locally, after a failure the same call skips the parts which
+    the server still holds and sends the rest.
+
+    Protocol:
+        init:     POST json {file_name, file_size, part_size, part_count, upload_id?, ...upload params}
+                  -> data {upload_id, parts: [acknowledged part numbers]}
+        part:     POST multipart {upload_id, part_number, md5, file} -> data {part_number, md5}
+        complete: POST json {upload_id, part_count, md5s} -> same result as upload_file
+
+    Parts of a file are joined in order by the server on complete. With partitioned=True in init, every part
+    is a partition of the table instead, part_number is the partition id and the server keeps parts as they are.
+    """
+    def __init__(self, api, part_size=DEFAULT_PART_SIZE, concurrency=DEFAULT_CONCURRENCY,
+                 retries=DEFAULT_PART_RETRIES, state_directory=DEFAULT_STATE_DIRECTORY, progress_callback=None):
+        if part_size <= 0:
+            raise ValueError(f"part_size should be positive, {part_size} found")
+        self._api = api
+        self._part_size = part_size
+        self._concurrency = max(concurrency, 1)
+        self._retries = max(retries, 0)
+        self._state_directory = state_directory
+        self._progress_callback = progress_callback
+        self._sent_bytes = 0
+        self._progress_lock = threading.Lock()
+
+    @staticmethod
+    def _check_response(response, action):
+        if isinstance(response, dict) and response.get("code") == 0:
+            return response.get("data") or {}
+        raise ChunkedUploadError(f"chunked upload {action} failed, response={response}", response)
+
+    @staticmethod
+    def _read_part(part):
+        path, offset, size = part
+        with open(path, "rb") as fin:
+            fin.seek(offset)
+            return fin.read(size)
+
+    def _report(self, size, total_bytes):
+        if self._progress_callback is None:
+            return
+        with self._progress_lock:
+            self._sent_bytes += size
+            sent_bytes = self._sent_bytes
+        self._progress_callback(sent_bytes, total_bytes)
+
+    def _upload_part(self, part, upload_id, part_number, total_bytes):
+        chunk = self._read_part(part)
+        md5 = hashlib.md5(chunk).hexdigest()
+        fields = dict(upload_id=upload_id, part_number=part_number, md5=md5)
+
+        for attempt in range(self._retries + 1):
+            body, headers = build_multipart_upload(fields, "file", f"part_{part_number}", chunk)
+            try:
+                response = self._api._post(url=CHUNKED_UPLOAD_PART_URL, data=body, headers=headers)
+            except ValueError as e:
+                response = {"code": 100, "message": f"invalid response, {e}"}
+            if isinstance(response, dict) and response.get("code") == 0 and \
+                    (response.get("data") or {}).get("md5", md5) == md5:
+                self._report(len(chunk), total_bytes)
+                return part_number, md5
+            if attempt == self._retries:
+                raise ChunkedUploadError(f"upload part {part_number} failed, response={response}", response)
+
+    def upload(self, file_path, **params):
+        """
+        Args:
+            file_path: local file
+            params: upload params sent with init, same as Data.upload_file: head, partitions, meta, ...
+
+        Returns:
+            response of complete, e.g. {'code': 0, 'message': 'success', 'job_id': ..., 'data': {...}}
+        """
+        file_size = os.path.getsize(file_path)
+        part_count = max((file_size + self._part_size - 1) // self._part_size, 1)
+        parts = [(file_path, part_number * self._part_size,
+                  min(self._part_size, file_size - part_number * self._part_size))
+                 for part_number in range(part_count)]
+
+        return self._upload_parts(file_path, parts, self._part_size, dict(part_size=self._part_size), params)
+
+    def upload_partitions(self, file_path, partition_paths, **params):
+        """
+        Upload pre-split partitions of file_path, one part per partition, the server stores part i as
+        partition i of the table without joining them
+
+        Args:
+            file_path: original file, identifies the upload for resuming
+            partition_paths: files of partitions, each one a csv with the header of file_path if it has one
+            params: upload params sent with init
+        """
+        parts = [(path, 0, os.path.getsize(path)) for path in partition_paths]
+        init_params = dict(partitioned=True, part_sizes=[size for _, _, size in parts])
+        return self._upload_parts(file_path, parts, 0, init_params, params)
+
+    def _upload_parts(self, file_path, parts, part_size, init_params, params):
+        file_size = sum(size for _, _, size in parts)
+        part_count = len(parts)
+        state = UploadState(self._state_directory, file_path, part_size, params)
+
+        init_params = dict(params, file_name=os.path.basename(file_path), file_size=file_size,
+                           part_count=part_count, **init_params)
+        if state.upload_id:
+            init_params["upload_id"] = state.upload_id
+        init_data = self._check_response(self._api._post(url=CHUNKED_UPLOAD_INIT_URL, json=init_params), "init")
+
+        upload_id = init_data["upload_id"]
+        server_parts = set(init_data.get("parts") or [])
+        if upload_id != state.upload_id:
+            state.reset(upload_id)
+        done_parts = {part_number for part_number in state.parts if part_number in server_parts}
+
+        pending_parts = [part_number for part_number in range(part_count) if part_number not in done_parts]
+        for part_number in done_parts:
+            self._report(parts[part_number][2], file_size)
+
+        with ThreadPoolExecutor(max_workers=self._concurrency, thread_name_prefix="chunked_upload") as executor:
+            futures = [executor.submit(self._upload_part, parts[part_number], upload_id, part_number, file_size)
+                       for part_number in pending_parts]
+            error = None
+            for future in as_completed(futures):
+                try:
+                    state.ack(*future.result())
+                except BaseException as e:
+                    if error is None:
+                        error = e
+                        for pending_future in futures:
+                            pending_future.cancel()
+            if error is not None:
+                raise error
+
+        complete_params = dict(upload_id=upload_id, part_count=part_count,
+                               md5s=[state.parts[part_number] for part_number in range(part_count)])
+        response = self._api._post(url=CHUNKED_UPLOAD_COMPLETE_URL, json=complete_params)
+        self._check_response(response, "complete")
+        state.remove()
+        return response
+
+
+def split_file_by_sample_id(file_path, partitions, directory, head=True, delimiter=",", id_column=None,
+                            buffer_size=UPLOAD_CHUNK_SIZE):
+    """
+    Stream a csv once and append every row to partition crc32(sample_id) % partitions, rows are parsed by the csv
+    module so quoted delimiters and line breaks stay in their field. Every partition gets the header, so each
+    one is a valid csv by itself
+
+    Args:
+        file_path: csv file
+        partitions: number of partitions
+        directory: where partition files are written
+        head: whether the first line is header
+        delimiter: column delimiter
+        id_column: name of the sample id column if head else its index, the first column if None
+
+    Returns:
+        list of partition file paths
+    """
+    if partitions <= 0:
+        raise ValueError(f"partitions should be positive, {partitions} found")
+
+    partition_paths = [os.path.join(directory, f"partition_{i}") for i in range(partitions)]
+    fouts = [open(path, "w", newline="", encoding="utf-8", buffering=buffer_size) for path in partition_paths]
+    try:
+        writers = [csv.writer(fout, delimiter=delimiter, lineterminator="\n") for fout in fouts]
+        with open(file_path, "r", newline="", encoding="utf-8") as fin:
+            reader = csv.reader(fin, delimiter=delimiter)
+            id_index = id_column if isinstance(id_column, int) else 0
+            if head:
+                header = next(reader, None)
+                if header is None:
+                    return partition_paths
+                if id_column is not None and not isinstance(id_column, int):
+                    columns = [column.strip() for column in header]
+                    if id_column not in columns:
+                        raise ValueError(f"sample id column {id_column} not found in header {columns}")
+                    id_index = columns.index(id_column)
+                for writer in writers:
+                    writer.writerow(header)
+
+            for row in reader:
+                if not row or not any(field.strip() for field in row):
+                    continue
+                if id_index >= len(row):
+                    raise ValueError(f"sample id column {id_index} not found in row {row}, line {reader.line_num}")
+                writers[zlib.crc32(row[id_index].encode("utf-8")) % partitions].writerow(row)
+    finally:
+        for fout in fouts:
+            fout.close()
+
+    return partition_paths
@@ -0,0 +1,225 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""
+Request instrumentation of BaseFlowClient. A hook is any callable taking a RequestRecord, registered by
+client.add_request_hook(hook); nothing is measured while no hook is registered.
+
+Usage:
+    metrics = RequestMetrics()
+    client.add_request_hook(metrics)
+    ...
+    print(metrics.prometheus_text())
+    # or serve it for prometheus to scrape
+    start_metrics_server(metrics, port=9464)
+"""
+import bisect
+import threading
+import time
+from collections import namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+DEFAULT_SIZE_BUCKETS = (1 << 10, 1 << 14, 1 << 17, 1 << 20, 1 << 23, 1 << 26, 1 << 30)
+
+RequestRecord = namedtuple("RequestRecord", ["method", "endpoint", "status_code", "latency", "request_bytes",
+                                             "response_bytes", "retries", "error"])
+
+
+def _body_size(prepped):
+    content_length = prepped.headers.get("Content-Length")
+    if content_length is not None:
+        return int(content_length)
+    if isinstance(prepped.body, (bytes, str)):
+        return len(prepped.body)
+    return 0
+
+
+class RequestTrace(object):
+    """
+    Measures one call of BaseFlowClient._request, retries included
+    """
+    __slots__ = ["method", "endpoint", "start", "request_bytes", "retries"]
+
+    def __init__(self, method, endpoint):
+        self.method = method.upper()
+        self.endpoint = endpoint
+        self.start = time.perf_counter()
+        self.request_bytes = 0
+        self.retries = -1
+
+    def on_attempt(self, prepped):
+        self.retries += 1
+        self.request_bytes = _body_size(prepped)
+
+    def finish(self, response) -> RequestRecord:
+        latency = time.perf_counter() - self.start
+        if isinstance(response, dict):
+            return RequestRecord(self.method, self.endpoint, None, latency, self.request_bytes, 0,
+                                 max(self.retries, 0), response.get("retmsg"))
+
+        content_length = response.headers.get("Content-Length")
+        if content_length is not None:
+            response_bytes = int(content_length)
+        elif getattr(response, "_content_consumed", False):
+            response_bytes = len(response.content)
+        else:
+            response_bytes = 0
+        return RequestRecord(self.method, self.endpoint, response.status_code, latency, self.request_bytes,
+                             response_bytes, max(self.retries, 0), None)
+
+
+class Histogram(object):
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self):
+        counts, total = [], 0
+        for count in self.counts:
+            total += count
+            counts.append(total)
+        return counts
+
+
+class EndpointMetrics(object):
+    def __init__(self, latency_buckets, size_buckets):
+        self.latency = Histogram(latency_buckets)
+        self.request_bytes = Histogram(size_buckets)
+        self.response_bytes = Histogram(size_buckets)
+        self.status_codes = dict()
+        self.retries = 0
+        self.errors = 0
+
+
+class RequestMetrics(object):
+    """
+    Hook aggregating records per (method, endpoint): latency and payload size histograms,
+    status code counts, retries and errors (requests which got no http response)
+    """
+    def __init__(self, latency_buckets=DEFAULT_LATENCY_BUCKETS, size_buckets=DEFAULT_SIZE_BUCKETS):
+        self._latency_buckets = latency_buckets
+        self._size_buckets = size_buckets
+        self._lock = threading.Lock()
+        self._endpoints = dict()
+
+    def __call__(self, record: RequestRecord):
+        key = (record.method, record.endpoint)
+        with self._lock:
+            if key not in self._endpoints:
+                self._endpoints[key] = EndpointMetrics(self._latency_buckets, self._size_buckets)
+            metrics = self._endpoints[key]
+            metrics.latency.observe(record.latency)
+            metrics.request_bytes.observe(record.request_bytes)
+            metrics.response_bytes.observe(record.response_bytes)
+            status = str(record.status_code) if record.status_code is not None else "error"
+            metrics.status_codes[status] = metrics.status_codes.get(status, 0) + 1
+            metrics.retries += record.retries
+            if record.error is not None:
+                metrics.errors += 1
+
+    def snapshot(self):
+        """
+        Returns:
+            dict, "METHOD endpoint" -> {count, latency_sum, latency_buckets, request_bytes_sum,
+                                        response_bytes_sum, status_codes, retries, errors}
+        """
+        with self._lock:
+            return {f"{method} {endpoint}": dict(
+                count=metrics.latency.count,
+                latency_sum=metrics.latency.sum,
+                latency_buckets=dict(zip(list(self._latency_buckets) + ["+Inf"],
+                                         metrics.latency.cumulative_counts())),
+                request_bytes_sum=metrics.request_bytes.sum,
+                response_bytes_sum=metrics.response_bytes.sum,
+                status_codes=dict(metrics.status_codes),
+                retries=metrics.retries,
+                errors=metrics.errors
+            ) for (method, endpoint), metrics in self._endpoints.items()}
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = dict()
+
+    def prometheus_text(self, prefix="fate_flow_client"):
+        """
+        Metrics in prometheus text exposition format
+        """
+        lines = []
+
+        def _histogram(name, help_text, attr):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} histogram")
+            for (method, endpoint), metrics in self._endpoints.items():
+                histogram = getattr(metrics, attr)
+                labels = f'method="{method}",endpoint="{endpoint}"'
+                for bound, count in zip(list(histogram.buckets) + ["+Inf"], histogram.cumulative_counts()):
+                    lines.append(f'{prefix}_{name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f"{prefix}_{name}_sum{{{labels}}} {histogram.sum}")
+                lines.append(f"{prefix}_{name}_count{{{labels}}} {histogram.count}")
+
+        def _counter(name, help_text, values):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for labels, value in values:
+                lines.append(f"{prefix}_{name}{{{labels}}} {value}")
+
+        with self._lock:
+            _histogram("request_latency_seconds", "Latency of requests to fate flow, retries included", "latency")
+            _histogram("request_size_bytes", "Size of request bodies", "request_bytes")
+            _histogram("response_size_bytes", "Size of response bodies", "response_bytes")
+            _counter("responses_total", "Responses by status code, error when no response was received",
+                     [(f'method="{method}",endpoint="{endpoint}",status="{status}"', count)
+                      for (method, endpoint), metrics in self._endpoints.items()
+                      for status, count in metrics.status_codes.items()])
+            _counter("retries_total", "Retries of requests",
+                     [(f'method="{method}",endpoint="{endpoint}"', metrics.retries)
+                      for (method, endpoint), metrics in self._endpoints.items()])
+
+        return "\n".join(lines) + "\n"
+
+
+def start_metrics_server(metrics: RequestMetrics, port, host="127.0.0.1"):
+    """
+    Serve metrics.prometheus_text() at /metrics in a daemon thread, only on localhost unless another host is given,
+    e.g. host="0.0.0.0" to let a remote prometheus scrape it
+
+    Returns:
+        server, call server.shutdown() to stop it
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            buf = metrics.prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(buf)))
+            self.end_headers()
+            self.wfile.write(buf)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
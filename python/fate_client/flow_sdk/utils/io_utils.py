@@ -12,39 +12,139 @@
 #  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
+import gzip
+import io
 import os
+import shutil
 import tarfile
+import tempfile
 import traceback
-import uuid
-from tempfile import TemporaryDirectory
 
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
-def download_from_request(http_response, download_path):
+TAR_STREAM_MODES = {
+    "application/gzip": "r|gz",
+    "application/x-tar": "r|"
+}
+
+
+class ResponseStream(object):
+    """
+    Read-only file object over a streamed http response, lets tarfile consume the body while it is downloading
+    """
+    def __init__(self, http_response, chunk_size=DOWNLOAD_CHUNK_SIZE, progress_callback=None):
+        self._chunks = http_response.iter_content(chunk_size)
+        self._buffer = memoryview(b"")
+        self._progress_callback = progress_callback
+        self._read_bytes = 0
+        content_length = http_response.headers.get("content-length")
+        self._total_bytes = int(content_length) if content_length else None
+
+    @property
+    def read_bytes(self):
+        return self._read_bytes
+
+    def read(self, size=-1):
+        if not self._buffer:
+            for chunk in self._chunks:
+                if chunk:
+                    self._buffer = memoryview(chunk)
+                    self._read_bytes += len(chunk)
+                    if self._progress_callback:
+                        self._progress_callback(self._read_bytes, self._total_bytes)
+                    break
+            else:
+                return b""
+
+        if size is None or size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data.tobytes()
+
+
+def check_tar_member(member: tarfile.TarInfo, download_path):
+    base_path = os.path.realpath(download_path)
+
+    def _in_base_path(path):
+        return os.path.commonpath([base_path, os.path.realpath(path)]) == base_path
+
+    member_path = os.path.join(base_path, member.name)
+    if not _in_base_path(member_path):
+        raise ValueError(f"illegal path {member.name} in tar, it is outside of {download_path}")
+
+    if member.issym() and not _in_base_path(os.path.join(os.path.dirname(member_path), member.linkname)):
+        raise ValueError(f"illegal symlink {member.name} -> {member.linkname} in tar")
+
+    if member.islnk() and not _in_base_path(os.path.join(base_path, member.linkname)):
+        raise ValueError(f"illegal hardlink {member.name} -> {member.linkname} in tar")
+
+    if member.isdev():
+        raise ValueError(f"illegal device file {member.name} in tar")
+
+
+def extract_tar_stream(fileobj, download_path, mode="r|gz"):
+    extract_kwargs = dict(filter="data") if hasattr(tarfile, "data_filter") else dict()
+    with tarfile.open(fileobj=fileobj, mode=mode) as tar:
+        for member in tar:
+            check_tar_member(member, download_path)
+            tar.extract(member, download_path, **extract_kwargs)
+
+
+class _TarMemberReader(io.RawIOBase):
+    """
+    Members extracted from a streamed tar can not tell whether they are seekable, which TextIOWrapper asks for
+    """
+    def __init__(self, member_fileobj):
+        self._fileobj = member_fileobj
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._fileobj.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def iter_tar_members(http_response, chunk_size=DOWNLOAD_CHUNK_SIZE, progress_callback=None):
+    """
+    Iterate regular files of a tar response without writing them to disk, each member must be consumed
+    before the next one is requested
+
+    Returns:
+        iterator of (tarfile.TarInfo, file object)
+    """
     try:
-        if http_response.headers.get('content-type') == 'application/json':
+        content_type = http_response.headers.get('content-type')
+        if content_type not in TAR_STREAM_MODES:
+            raise ValueError(f"download failed, content-type={content_type}, response={http_response.text}")
+        fileobj = ResponseStream(http_response, chunk_size=chunk_size, progress_callback=progress_callback)
+        with tarfile.open(fileobj=fileobj, mode=TAR_STREAM_MODES[content_type]) as tar:
+            for member in tar:
+                if member.isfile():
+                    yield member, io.BufferedReader(_TarMemberReader(tar.extractfile(member)))
+    finally:
+        if hasattr(http_response, "close"):
+            http_response.close()
+
+
+def download_from_request(http_response, download_path, progress_callback=None, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    """
+    Args:
+        http_response: response of a request sent with stream=True
+        download_path: directory to extract into
+        progress_callback: called as progress_callback(read_bytes, total_bytes) when a chunk arrives,
+            total_bytes is None if the server does not send content-length
+        chunk_size: bytes per read from socket
+    """
+    try:
+        content_type = http_response.headers.get('content-type')
+        if content_type == 'application/json':
             return http_response.json()
-        if http_response.headers.get('content-type') == 'application/gzip':
-            with TemporaryDirectory() as output_tmp_dir:
-                path = os.path.join(output_tmp_dir, str(uuid.uuid1()))
-                with open(path, 'wb') as fw:
-                    for chunk in http_response.iter_content(1024):
-                        if chunk:
-                            fw.write(chunk)
-                tar = tarfile.open(path, "r:gz")
-                file_names = tar.getnames()
-                for file_name in file_names:
-                    tar.extract(file_name, download_path)
-                tar.close()
-        if http_response.headers.get('content-type') == 'application/x-tar':
-            with TemporaryDirectory() as output_tmp_dir:
-                path = os.path.join(output_tmp_dir, str(uuid.uuid1()))
-                with open(path, 'wb') as fw:
-                    for chunk in http_response.iter_content(1024):
-                        if chunk:
-                            fw.write(chunk)
-                tar = tarfile.open(path, "r:tar")
-                tar.extractall(path=download_path)
-                tar.close()
+        if content_type in TAR_STREAM_MODES:
+            fileobj = ResponseStream(http_response, chunk_size=chunk_size, progress_callback=progress_callback)
+            extract_tar_stream(fileobj, download_path, mode=TAR_STREAM_MODES[content_type])
         return {
             "code": 0,
             "directory": download_path,
@@ -53,3 +153,50 @@ def download_from_request(http_response, download_path):
     except Exception as e:
         traceback.format_exc()
         return {"code": 100, "message": f"download failed, {str(e)}"}
+    finally:
+        if hasattr(http_response, "close"):
+            http_response.close()
+
+
+def gzip_to_temp_file(file_path, chunk_size=UPLOAD_CHUNK_SIZE):
+    """
+    Compress file_path into an anonymous temporary file chunk by chunk, the returned file object is positioned
+    at the beginning and removed once closed
+    """
+    temp_file = tempfile.TemporaryFile()
+    try:
+        with open(file_path, "rb") as fin, gzip.GzipFile(fileobj=temp_file, mode="wb") as fout:
+            shutil.copyfileobj(fin, fout, chunk_size)
+        temp_file.seek(0)
+    except BaseException:
+        temp_file.close()
+        raise
+
+    return temp_file
+
+
+def build_multipart_upload(fields: dict, file_field: str, file_name: str, fileobj, content_type=None,
+                           progress_callback=None):
+    """
+    Streaming multipart/form-data body, the file is read in chunks while the request is sent
+
+    Args:
+        fields: form fields, values are converted to str
+        file_field: form field name of the file
+        file_name: file name sent to the server
+        fileobj: opened binary file
+        content_type: content type of the file part
+        progress_callback: called as progress_callback(sent_bytes, total_bytes) while the body is sent
+
+    Returns:
+        (body, headers) to be passed to requests as data=body, headers=headers
+    """
+    from requests_toolbelt import MultipartEncoder, MultipartEncoderMonitor
+
+    form = {key: str(value) for key, value in fields.items()}
+    form[file_field] = (file_name, fileobj, content_type or "application/octet-stream")
+    body = MultipartEncoder(fields=form)
+    if progress_callback is not None:
+        body = MultipartEncoderMonitor(body, lambda monitor: progress_callback(monitor.bytes_read, monitor.len))
+
+    return body, {"Content-Type": body.content_type}
@@ -0,0 +1,220 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import csv
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+
+PREDICT_TEMPLATE_COLUMNS = ["label", "predict_result", "predict_score", "predict_detail", "type"]
+PREDICT_DETAIL_COLUMN = "predict_detail"
+DEFAULT_CHUNK_SIZE = 100000
+COLUMNAR_FORMATS = {"parquet": ".parquet", "feather": ".feather"}
+OUTPUT_FILE_SUFFIXES = (".csv", ) + tuple(COLUMNAR_FORMATS.values())
+
+
+def is_predict_output(columns) -> bool:
+    columns = set(columns)
+    return sum(1 for col in PREDICT_TEMPLATE_COLUMNS if col in columns) >= 4
+
+
+def decode_predict_detail(predict_detail):
+    """
+    Decode a series of predict_detail strings like "{'0': 0.2, '1': 0.8}" with one json.loads call per batch
+
+    Args:
+        predict_detail: pandas.Series of str
+
+    Returns:
+        list of dict, aligned with predict_detail
+    """
+    values = predict_detail.fillna("{}").astype(str).str.replace("'", "\"", regex=False)
+    return json.loads("[" + ",".join(values) + "]")
+
+
+def expand_predict_detail(df, details):
+    """
+    Replace predict_detail column of df with one float column per detail key, named predict_detail_{key}
+    """
+    import pandas as pd
+
+    detail_df = pd.DataFrame.from_records(details, index=df.index)
+    detail_df = detail_df.apply(pd.to_numeric, errors="coerce").add_prefix(f"{PREDICT_DETAIL_COLUMN}_")
+
+    loc = df.columns.get_loc(PREDICT_DETAIL_COLUMN)
+    return pd.concat([df.iloc[:, :loc], detail_df, df.iloc[:, loc + 1:]], axis=1)
+
+
+@contextmanager
+def _open_csv(path_or_buffer):
+    if isinstance(path_or_buffer, (str, Path)):
+        with open(path_or_buffer, "rb") as fin:
+            yield fin
+    else:
+        yield path_or_buffer
+
+
+def get_output_dtype(header):
+    """
+    Prediction outputs are read as str like the line parser they replaced, other outputs keep pandas type
+    inference like pd.read_csv did before
+    """
+    if is_predict_output(header):
+        return str
+    return None
+
+
+def iter_output_csv(path_or_buffer, chunksize=DEFAULT_CHUNK_SIZE, columns=None, expand=False):
+    """
+    Read an output csv of a task chunk by chunk, predict_detail of prediction outputs is decoded per chunk,
+    column types follow get_output_dtype
+
+    Args:
+        path_or_buffer: path of csv file or a readable text/binary file object
+        chunksize: max rows of each yielded chunk
+        columns: only keep these columns, None to keep all, files without any of them yield nothing
+        expand: expand predict_detail to float columns instead of a column of dict
+
+    Returns:
+        iterator of pandas.DataFrame
+    """
+    import pandas as pd
+
+    usecols = None
+    if columns is not None:
+        usecols = lambda col: col in columns
+
+    with _open_csv(path_or_buffer) as fin:
+        header_line = fin.readline()
+        if isinstance(header_line, bytes):
+            header_line = header_line.decode("utf-8")
+        header = next(csv.reader([header_line]), [])
+        if not header:
+            return
+        is_predict = is_predict_output(header)
+
+        with pd.read_csv(fin, header=None, names=header, dtype=get_output_dtype(header), chunksize=chunksize,
+                         usecols=usecols) as reader:
+            for chunk in reader:
+                if chunk.columns.empty:
+                    return
+                if PREDICT_DETAIL_COLUMN in chunk.columns and (columns is not None or is_predict):
+                    details = decode_predict_detail(chunk[PREDICT_DETAIL_COLUMN])
+                    if expand:
+                        chunk = expand_predict_detail(chunk, details)
+                    else:
+                        chunk[PREDICT_DETAIL_COLUMN] = details
+
+                yield chunk
+
+
+def read_output_csv(path_or_buffer, chunksize=DEFAULT_CHUNK_SIZE, columns=None, expand=False):
+    """
+    Same as iter_output_csv but returns a single pandas.DataFrame
+    """
+    import pandas as pd
+
+    chunks = list(iter_output_csv(path_or_buffer, chunksize=chunksize, columns=columns, expand=expand))
+    if not chunks:
+        return pd.DataFrame()
+    if len(chunks) == 1:
+        return chunks[0]
+
+    return pd.concat(chunks, ignore_index=True)
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("parquet/feather output needs pyarrow, please install it by `pip install pyarrow`")
+
+    return pyarrow
+
+
+def _check_columnar_format(fmt):
+    if fmt not in COLUMNAR_FORMATS:
+        raise ValueError(f"format should be one of {list(COLUMNAR_FORMATS)}, {fmt} found")
+
+
+def csv_to_columnar(csv_path, dst_path, fmt="parquet", chunksize=DEFAULT_CHUNK_SIZE):
+    """
+    Convert an output csv to parquet or feather chunk by chunk, predict_detail is expanded to float columns
+
+    Args:
+        csv_path: path of output csv
+        dst_path: path of converted file
+        fmt: "parquet" or "feather"
+        chunksize: rows converted at a time, bounds memory use
+    """
+    _check_columnar_format(fmt)
+    pa = _import_pyarrow()
+
+    writer = None
+    schema = None
+    try:
+        for chunk in iter_output_csv(csv_path, chunksize=chunksize, expand=True):
+            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                if fmt == "parquet":
+                    writer = pa.parquet.ParquetWriter(str(dst_path), schema)
+                else:
+                    writer = pa.ipc.new_file(str(dst_path), schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def materialize_output_dir(src_dir, dst_dir, fmt="parquet", chunksize=DEFAULT_CHUNK_SIZE):
+    """
+    Convert every {output_key}/{file}.csv under src_dir to {output_key}/{file}.{fmt} under dst_dir,
+    src_dir and dst_dir may be the same directory
+
+    Returns:
+        list of converted paths
+    """
+    _check_columnar_format(fmt)
+    converted = []
+    for csv_path in sorted(Path(src_dir).glob("*/*.csv")):
+        dst_path = Path(dst_dir).joinpath(csv_path.parent.name, csv_path.stem + COLUMNAR_FORMATS[fmt])
+        os.makedirs(dst_path.parent, exist_ok=True)
+        csv_to_columnar(csv_path, dst_path, fmt=fmt, chunksize=chunksize)
+        converted.append(dst_path)
+
+    return converted
+
+
+def read_output_file(path, columns=None, expand=False):
+    """
+    Load an output file written as csv, parquet or feather, the columnar ones are memory-mapped and
+    only the requested columns are read
+    """
+    import pandas as pd
+
+    suffix = Path(path).suffix
+    if suffix == COLUMNAR_FORMATS["parquet"]:
+        _import_pyarrow()
+        return pd.read_parquet(path, columns=columns, memory_map=True)
+    if suffix == COLUMNAR_FORMATS["feather"]:
+        pa = _import_pyarrow()
+        return pa.feather.read_table(str(path), columns=columns, memory_map=True).to_pandas()
+
+    return read_output_csv(path, columns=columns, expand=expand)
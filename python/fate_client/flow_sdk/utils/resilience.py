@@ -0,0 +1,193 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import random
+import threading
+import time
+
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_READ_TIMEOUT = 600
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 30
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30
+
+RETRY_STATUS_CODES = frozenset([502, 503, 504])
+IDEMPOTENT_METHODS = frozenset(["get", "head", "options"])
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+def is_connection_refused(e: BaseException) -> bool:
+    """
+    Whether e, or an error it wraps, is a refused connection, i.e. nothing listens on the server address
+    """
+    seen = set()
+    pending = [e]
+    while pending:
+        error = pending.pop()
+        if error is None or id(error) in seen:
+            continue
+        seen.add(id(error))
+        if isinstance(error, ConnectionRefusedError):
+            return True
+        pending.extend([error.__cause__, error.__context__, getattr(error, "reason", None)])
+        pending.extend(arg for arg in getattr(error, "args", ()) if isinstance(arg, BaseException))
+
+    return "connection refused" in str(e).lower()
+
+
+class CircuitBreaker(object):
+    """
+    closed: requests pass, consecutive failures are counted, failure_threshold of them open the circuit
+    open: requests fail fast until reset_timeout seconds passed, then the circuit is half open
+    half open: one trial request passes, success closes the circuit and failure opens it again
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=DEFAULT_FAILURE_THRESHOLD, reset_timeout=DEFAULT_RESET_TIMEOUT):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0
+        self._trial_running = False
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self._reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def before_request(self):
+        """
+        Raises:
+            CircuitOpenError if the request should not be sent
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self._reset_timeout:
+                    raise CircuitOpenError(f"circuit breaker is open after {self._failures} consecutive failures")
+                self._state = self.HALF_OPEN
+                self._trial_running = False
+            if self._trial_running:
+                raise CircuitOpenError("circuit breaker is half open and a trial request is running")
+            self._trial_running = True
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._state == self.HALF_OPEN or self._failures >= self._failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class ResilienceStats(object):
+    FIELDS = ["requests", "retries", "failures", "timeouts", "circuit_rejections", "circuit_opens"]
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(self.FIELDS, 0)
+
+    def incr(self, field, value=1):
+        with self._lock:
+            self._counters[field] += value
+
+    def dict(self):
+        with self._lock:
+            return dict(self._counters)
+
+
+class ResiliencePolicy(object):
+    """
+    Timeouts, retries and circuit breaker of BaseFlowClient._request.
+
+    Args:
+        connect_timeout / read_timeout: seconds, None waits forever
+        endpoint_timeouts: dict, uri prefix -> (connect_timeout, read_timeout), the longest matching prefix wins,
+            e.g. {"/output/data/download": (10, 3600)}
+        max_retries: retries of idempotent requests (GET) on connection errors, timeouts and 502/503/504,
+            other methods are never retried since the server may have applied them, refused connections are
+            not retried either since nothing listens on the address, e.g. fate flow is not started
+        backoff_base / backoff_max: retry n sleeps uniform(0, min(backoff_max, backoff_base * 2 ** n)) seconds
+        failure_threshold / reset_timeout: circuit breaker settings, failure_threshold=0 disables it
+    """
+    def __init__(self, connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 endpoint_timeouts=None, max_retries=DEFAULT_MAX_RETRIES, backoff_base=DEFAULT_BACKOFF_BASE,
+                 backoff_max=DEFAULT_BACKOFF_MAX, failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout=DEFAULT_RESET_TIMEOUT):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.endpoint_timeouts = sorted((endpoint_timeouts or {}).items(), key=lambda item: -len(item[0]))
+        self.max_retries = max(max_retries, 0)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.circuit_breaker = CircuitBreaker(failure_threshold, reset_timeout) if failure_threshold > 0 else None
+        self.stats = ResilienceStats()
+
+    def get_timeout(self, uri):
+        for prefix, timeout in self.endpoint_timeouts:
+            if uri.startswith(prefix):
+                return tuple(timeout)
+        return self.connect_timeout, self.read_timeout
+
+    def get_retries(self, method):
+        return self.max_retries if method.lower() in IDEMPOTENT_METHODS else 0
+
+    @staticmethod
+    def should_retry(e: BaseException) -> bool:
+        return not is_connection_refused(e)
+
+    def get_backoff(self, attempt):
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def before_request(self):
+        self.stats.incr("requests")
+        if self.circuit_breaker is None:
+            return
+        try:
+            self.circuit_breaker.before_request()
+        except CircuitOpenError:
+            self.stats.incr("circuit_rejections")
+            raise
+
+    def record_success(self):
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_success()
+
+    def record_failure(self, timeout=False):
+        self.stats.incr("failures")
+        if timeout:
+            self.stats.incr("timeouts")
+        if self.circuit_breaker is not None:
+            was_open = self.circuit_breaker.state == CircuitBreaker.OPEN
+            self.circuit_breaker.record_failure()
+            if not was_open and self.circuit_breaker.state == CircuitBreaker.OPEN:
+                self.stats.incr("circuit_opens")
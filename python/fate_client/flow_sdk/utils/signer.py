@@ -0,0 +1,111 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import hashlib
+import hmac
+import os
+import time
+from collections import deque
+
+_NONCE_BUFFER_SIZE = 4096
+# two random bytes give 0..65535, values from 63000 are dropped so that % 9000 stays uniform
+_NONCE_LIMIT = 63000
+
+
+class NonceGenerator(object):
+    """
+    4 digit nonces, 1000..9999 like random.randint(1000, 9999), decoded in batches from os.urandom bytes
+    """
+    def __init__(self, buffer_size=_NONCE_BUFFER_SIZE):
+        self._buffer_size = buffer_size
+        self._nonces = deque()
+
+    def _refill(self):
+        values = memoryview(os.urandom(self._buffer_size)).cast("H")
+        self._nonces.extend([str(1000 + value % 9000) for value in values if value < _NONCE_LIMIT])
+
+    def __call__(self):
+        while True:
+            try:
+                return self._nonces.popleft()
+            except IndexError:
+                self._refill()
+
+
+class Signer(object):
+    """
+    Signs requests for a fate flow server with client authentication enabled, the headers are
+    appId, userName, Nonce, Timestamp and Signature
+    """
+    def __init__(self, app_id, app_token, user_name=""):
+        self.app_id = app_id
+        self.app_token = app_token
+        self.user_name = user_name
+        self._nonce = NonceGenerator()
+
+    @staticmethod
+    def timestamp():
+        return str(int(time.time()) * 1000)
+
+    def sign(self, nonce, timestamp) -> str:
+        raise NotImplementedError
+
+    def generate_signature_params(self):
+        nonce = self._nonce()
+        timestamp = self.timestamp()
+        return nonce, timestamp, self.sign(nonce, timestamp)
+
+    def headers(self):
+        nonce, timestamp, sign = self.generate_signature_params()
+        return {
+            "appId": self.app_id,
+            "userName": self.user_name,
+            "Nonce": nonce,
+            "Timestamp": timestamp,
+            "Signature": sign
+        }
+
+
+class Md5Signer(Signer):
+    """
+    Default scheme: md5(md5(app_id + user_name + nonce + timestamp).hexdigest() + app_token).hexdigest(),
+    the md5 state of app_id + user_name is computed once and copied per request
+    """
+    def __init__(self, app_id, app_token, user_name=""):
+        super().__init__(app_id, app_token, user_name)
+        self._prefix = hashlib.md5(str(app_id + user_name).encode("utf8"))
+        self._token = str(app_token).encode("utf8")
+
+    def sign(self, nonce, timestamp) -> str:
+        temp = self._prefix.copy()
+        temp.update(str(nonce + timestamp).encode("utf8"))
+        sign = hashlib.md5(temp.hexdigest().encode("utf8"))
+        sign.update(self._token)
+        return sign.hexdigest()
+
+
+class HmacSha256Signer(Signer):
+    """
+    hmac_sha256(key=app_token, msg=app_id + user_name + nonce + timestamp).hexdigest(),
+    the server should be configured with the same scheme
+    """
+    def __init__(self, app_id, app_token, user_name=""):
+        super().__init__(app_id, app_token, user_name)
+        self._prefix = hmac.new(str(app_token).encode("utf8"), str(app_id + user_name).encode("utf8"),
+                                hashlib.sha256)
+
+    def sign(self, nonce, timestamp) -> str:
+        mac = self._prefix.copy()
+        mac.update(str(nonce + timestamp).encode("utf8"))
+        return mac.hexdigest()
@@ -12,7 +12,6 @@
 #  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
-import copy
 import uuid
 
 from types import SimpleNamespace
@@ -26,6 +25,26 @@ from ..entity.dag_structures import OutputArtifactSpec, PartySpec
 from ..entity.runtime_entity import Parties
 
 
+def _get_index_key(index):
+    if not isinstance(index, (int, list, slice)):
+        raise ValueError("Index should be int or list of integer")
+
+    if isinstance(index, slice):
+        if index.start is None or index.stop is None:
+            raise ValueError(f"Slice {index} is not support, start and stop should be given")
+        start = index.start
+        stop = index.stop
+        step = index.step if index.step else 1 if start < stop else -1
+        index = [idx for idx in range(start, stop, step)]
+        if len(index) == 1:
+            index = index[0]
+
+    if isinstance(index, list):
+        index.sort()
+
+    return str(index) if isinstance(index, int) else "|".join(map(str, index))
+
+
 class Component(object):
     __instance = {}
 
@@ -41,7 +60,7 @@ class Component(object):
         self._callable = True
         self._outputs = None
         self._task_parameters = dict()
-        self._task_conf = TaskConf()
+        self._task_conf = TaskConf(on_change=self._mark_dirty)
         self._stage = None
 
         if self.yaml_define_path is None:
@@ -62,45 +81,33 @@ class Component(object):
 
         return new_cls
 
-    def set_name(self, idx):
-        self._name = self.__class__.__name__.lower() + "_" + str(idx)
+    def __setattr__(self, key, value):
+        object.__setattr__(self, key, value)
+        self._mark_dirty()
 
-    def _set_role(self, role):
-        self._role = role
+    def _mark_dirty(self):
+        self.__dict__["_revision"] = self.__dict__.get("_revision", 0) + 1
 
-    def _set_index(self, idx):
-        self._index = idx
+    @property
+    def revision(self):
+        """
+        Increases whenever inputs, parameters, conf or party instances of the component change, conf and party views
+        bump it through _mark_dirty so it never goes back to a value already seen.
+        DAG.compile only rebuilds tasks whose revision moved since the last compile.
+        """
+        return self.__dict__.get("_revision", 0)
 
-    def _set_callable(self, status):
-        self._callable = status
+    def set_name(self, idx):
+        self._name = self.__class__.__name__.lower() + "_" + str(idx)
 
     def callable(self):
         return self._callable
 
-    def __getitem__(self, index) -> "Component":
-        if not isinstance(index, (int, list, slice)):
-            raise ValueError("Index should be int or list of integer")
-
-        if isinstance(index, slice):
-            if index.start is None or index.stop is None:
-                raise ValueError(f"Slice {index} is not support, start and stop should be given")
-            start = index.start
-            stop = index.stop
-            step = index.step if index.step else 1 if start < stop else -1
-            index = [idx for idx in range(start, stop, step)]
-            if len(index) == 1:
-                index = index[0]
-
-        if isinstance(index, list):
-            index.sort()
-        index_key = str(index) if isinstance(index, int) else "|".join(map(str, index))
-
-        # del self.__party_instance[self._role]["party"][self._index]
-        self._set_index(index_key)
-        self._set_callable(True)
-
-        self.__party_instance[self._index] = copy.deepcopy(self)
-        return self.__party_instance[self._index]
+    def __getitem__(self, index) -> "ComponentPartyView":
+        index_key = _get_index_key(index)
+        self.__party_instance[index_key] = ComponentPartyView(self, self._role, index_key)
+        self._mark_dirty()
+        return self.__party_instance[index_key]
 
     @property
     def guest(self) -> "Component":
@@ -125,7 +132,7 @@ class Component(object):
     def stage(self, stage):
         self._stage = stage
 
-    def get_party_instance(self, role="guest") -> 'Component':
+    def get_party_instance(self, role="guest") -> "ComponentPartyView":
         if role not in self.support_roles:
             raise ValueError("Role should be one of guest/host/arbiter")
 
@@ -134,21 +141,11 @@ class Component(object):
 
         index = str(uuid.uuid1())
 
-        inst = copy.deepcopy(self)
-        inst.party_instance = {}
-        self._decrease_instance_count()
-
-        inst._set_role(role)
-        inst._set_index(index)
-        inst._set_callable(False)
-
+        inst = ComponentPartyView(self, role)
         self.__party_instance[role][index] = inst
+        self._mark_dirty()
         return inst
 
-    @classmethod
-    def _decrease_instance_count(cls):
-        cls.__instance[cls.__name__.lower()] -= 1
-
     @property
     def party_instance(self):
         return self.__party_instance
@@ -185,6 +182,7 @@ class Component(object):
     def task_parameters(self, **kwargs):
         for attr, val in kwargs.items():
             self._task_parameters[attr] = val
+        self._mark_dirty()
 
     def get_task_parameters(self):
         return self._task_parameters
@@ -222,10 +220,32 @@ class Component(object):
                 if index not in party_index:
                     continue
 
-                conf.update(party_inst.conf.dict())
+                conf.update(party_inst.get_task_conf())
 
         return conf
 
+    def get_party_index(self):
+        """
+        Merge parameters and conf of all party instances in one pass, same result as calling
+        get_role_parameters / get_role_conf for every (role, party index) but without rescanning instances.
+
+        Returns:
+            dict, (role, index) -> (parameters, conf), index is str, only parties set through instances appear
+        """
+        party_index = dict()
+        for role, role_inst_dict in self.__party_instance.items():
+            for _, inst in role_inst_dict.items():
+                for party_key, party_inst in inst.party_instance.items():
+                    task_parameters = party_inst.get_task_parameters()
+                    task_conf = party_inst.get_task_conf()
+                    for index in party_key.split("|"):
+                        if (role, index) not in party_index:
+                            party_index[(role, index)] = (dict(), dict())
+                        party_index[(role, index)][0].update(task_parameters)
+                        party_index[(role, index)][1].update(task_conf)
+
+        return party_index
+
     def validate_runtime_env(self, roles):
         runtime_roles = roles.get_runtime_roles()
         for role, role_inst in self.__party_instance.items():
@@ -435,6 +455,8 @@ class Component(object):
         self._version = self._component_spec.version
 
     def _convert_party_dict_to_party_inst(self):
+        if isinstance(self.runtime_parties, Parties):
+            return
         if not self.runtime_parties:
             self.runtime_parties = Parties()
         elif isinstance(self.runtime_parties, dict):
@@ -443,3 +465,54 @@ class Component(object):
                 if role in self.component_spec.roles:
                     runtime_parties.set_party(role=role, party_id=party_id)
             self.runtime_parties = runtime_parties
+
+
+class ComponentPartyView(object):
+    """
+    Role or party specific view of a component, returned by component.guest, component.hosts[i] and so on.
+    It only holds the parameters and conf set through it, everything else is read from the component.
+    """
+    def __init__(self, component: Component, role, index=None):
+        self._component = component
+        self._role = role
+        self._index = index
+        self._task_parameters = dict()
+        self._task_conf = TaskConf(on_change=component._mark_dirty)
+        self._party_instance = dict()
+
+    def __getitem__(self, index) -> "ComponentPartyView":
+        index_key = _get_index_key(index)
+        self._party_instance[index_key] = ComponentPartyView(self._component, self._role, index_key)
+        self._component._mark_dirty()
+        return self._party_instance[index_key]
+
+    def __getattr__(self, attr):
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        return getattr(self._component, attr)
+
+    def callable(self):
+        return self._index is not None
+
+    @property
+    def party_instance(self):
+        return self._party_instance
+
+    @property
+    def conf(self):
+        return self._task_conf
+
+    def task_parameters(self, **kwargs):
+        for attr, val in kwargs.items():
+            self._task_parameters[attr] = val
+        self._component._mark_dirty()
+
+    def get_task_parameters(self):
+        task_parameters = dict(self._component.get_task_parameters())
+        task_parameters.update(self._task_parameters)
+        return task_parameters
+
+    def get_task_conf(self):
+        conf = dict(self._component.conf.dict())
+        conf.update(self._task_conf.dict())
+        return conf
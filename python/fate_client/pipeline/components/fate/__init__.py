@@ -33,6 +33,24 @@ from .statistics import Statistics
 from .union import Union
 from .homo_lr import HomoLR
 from .hetero_secureboost import HeteroSecureBoost
-from .homo_nn import HomoNN
-from .hetero_nn import HeteroNN
 from .evaluation import Evaluation
+
+# NN components import torch and transformers, load them only when they are used
+_LAZY_COMPONENTS = {
+    "HomoNN": ".homo_nn",
+    "HeteroNN": ".hetero_nn"
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_COMPONENTS:
+        raise AttributeError(f"module {__name__} has no attribute {name}")
+
+    import importlib
+    component = getattr(importlib.import_module(_LAZY_COMPONENTS[name], __name__), name)
+    globals()[name] = component
+    return component
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_COMPONENTS))
@@ -18,7 +18,7 @@ from pathlib import Path
 from ruamel import yaml
 
 
-__all__ = ["StatusCode", "FlowConfig", "SiteInfo"]
+__all__ = ["StatusCode", "FlowConfig", "SiteInfo", "OutputCacheConfig", "UploadDedupConfig"]
 
 
 with Path(__file__).parent.parent.parent.joinpath("settings.yaml").resolve().open("r") as fin:
@@ -53,6 +53,20 @@ class FlowConfig(object):
     VERSION = conf.get("api_version")
 
 
+class OutputCacheConfig(object):
+    conf = get_default_config().get("pipeline", {}).get("output_cache") or {}
+    ENABLE = conf.get("enable", False) is True
+    DIRECTORY = conf.get("directory") or str(Path.home().joinpath(".fate_client", "output_cache"))
+    MAX_SIZE = int(conf.get("max_size") or 4 * 1024 ** 3)
+    MEMORY_ITEMS = int(conf.get("memory_items") or 32)
+
+
+class UploadDedupConfig(object):
+    conf = get_default_config().get("pipeline", {}).get("upload_dedup") or {}
+    ENABLE = conf.get("enable", False) is True
+    INDEX_PATH = conf.get("index_path") or str(Path.home().joinpath(".fate_client", "upload_index.json"))
+
+
 class LOGGER(object):
     def __init__(self, conf):
         self._level = conf.get("logger", {}).get("level", "DEBUG")
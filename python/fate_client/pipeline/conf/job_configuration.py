@@ -13,19 +13,33 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 class JobConf(object):
-    def __init__(self):
+    def __init__(self, on_change=None):
         self._conf = dict()
+        self._revision = 0
+        self._on_change = on_change
+
+    def _changed(self):
+        self._revision += 1
+        if self._on_change is not None:
+            self._on_change()
 
     def set(self, k, v):
         self._conf[k] = v
+        self._changed()
 
     def set_all(self, **kwargs):
         self._conf.update(kwargs)
+        self._changed()
 
     def update(self, conf: dict):
         for k, v in conf.items():
             if k not in self._conf:
                 self._conf[k] = v
+                self._changed()
+
+    @property
+    def revision(self):
+        return self._revision
 
     def dict(self):
         return self._conf
@@ -14,9 +14,11 @@
 #  limitations under the License.
 from .dag import DAG
 from .task_info import FateFlowTaskInfo
+from .job_handle import JobHandle
 
 
 __all__ = [
     "DAG",
     "FateFlowTaskInfo",
+    "JobHandle",
 ]
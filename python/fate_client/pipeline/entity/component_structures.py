@@ -12,6 +12,7 @@
 #  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
+import threading
 from typing import Optional, Dict, List, Union, Any
 from pathlib import Path
 from pydantic import BaseModel
@@ -20,7 +21,22 @@ from ..utils.file_utils import load_yaml_file
 TypeSpecType = Union[str, Dict, List]
 
 
-class ParameterSpec(BaseModel):
+class SharedSpecModel(BaseModel):
+    """
+    Specs loaded from component definitions are shared by every component instance, so they are immutable
+    and copying returns the same object
+    """
+    class Config:
+        allow_mutation = False
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class ParameterSpec(SharedSpecModel):
     type: str
     default: Any
     optional: bool
@@ -28,7 +44,7 @@ class ParameterSpec(BaseModel):
     type_meta: dict = {}
 
 
-class ArtifactSpec(BaseModel):
+class ArtifactSpec(SharedSpecModel):
     types: List[str]
     optional: bool
     stages: Optional[List[str]]
@@ -37,18 +53,18 @@ class ArtifactSpec(BaseModel):
     is_multi: bool
 
 
-class InputArtifactsSpec(BaseModel):
+class InputArtifactsSpec(SharedSpecModel):
     data: Dict[str, ArtifactSpec]
     model: Dict[str, ArtifactSpec]
 
 
-class OutputArtifactsSpec(BaseModel):
+class OutputArtifactsSpec(SharedSpecModel):
     data: Dict[str, ArtifactSpec]
     model: Dict[str, ArtifactSpec]
     metric: Dict[str, ArtifactSpec]
 
 
-class ComponentSpec(BaseModel):
+class ComponentSpec(SharedSpecModel):
     name: str
     description: str
     provider: str
@@ -70,9 +86,39 @@ class RuntimeInputDefinition(BaseModel):
     artifacts: Optional[Dict[str, Dict[str, RuntimeOutputChannelSpec]]]
 
 
+class ComponentSpecRegistry(object):
+    """
+    Process-wide registry of component specs, each yaml definition is parsed once and the ComponentSpec is
+    shared afterwards
+    """
+    def __init__(self):
+        self._specs = dict()
+        self._lock = threading.Lock()
+
+    def get(self, yaml_define_path) -> "ComponentSpec":
+        path = Path(__file__).parent.parent.joinpath(yaml_define_path).resolve()
+        spec = self._specs.get(path)
+        if spec is None:
+            with self._lock:
+                spec = self._specs.get(path)
+                if spec is None:
+                    spec = _build_component_spec(load_yaml_file(str(path))["component"])
+                    self._specs[path] = spec
+        return spec
+
+    def clear(self):
+        with self._lock:
+            self._specs.clear()
+
+
+component_spec_registry = ComponentSpecRegistry()
+
+
 def load_component_spec(yaml_define_path: str):
-    yaml_define_path = Path(__file__).parent.parent.joinpath(yaml_define_path).resolve()
-    component_spec_dict = load_yaml_file(str(yaml_define_path))["component"]
+    return component_spec_registry.get(yaml_define_path)
+
+
+def _build_component_spec(component_spec_dict: dict):
     parameters = dict()
     if "parameters" in component_spec_dict:
         for key, value in component_spec_dict["parameters"].items():
@@ -12,8 +12,6 @@
 #  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
-import copy
-
 from .runtime_entity import PartySpec
 from .dag_structures import RuntimeInputArtifacts, DAGSpec, DAGSchema, \
     TaskSpec, PartyTaskRefSpec, PartyTaskSpec, JobConfSpec
@@ -25,88 +23,58 @@ SCHEMA_VERSION = "2.1.0"
 class DAG(object):
     def __init__(self):
         self._dag_spec = None
+        self._dag_schema = None
         self._is_compiled = False
         self._kind = "fate"
+        self._task_cache = dict()
+        self._cache_key = None
 
     @property
     def dag_spec(self):
         if not self._is_compiled:
             raise ValueError("Please compile pipeline first")
 
-        return DAGSchema(dag=self._dag_spec, schema_version=SCHEMA_VERSION, kind=self._kind)
+        if self._dag_schema is None:
+            self._dag_schema = DAGSchema(dag=self._dag_spec, schema_version=SCHEMA_VERSION, kind=self._kind)
+        return self._dag_schema
 
     def compile(self, parties, task_insts, stage, job_conf, protocol_kind):
+        """
+        Tasks are compiled incrementally: TaskSpec and party task refs of a task are reused when the component,
+        its revision and its runtime parties are the same as in the last compile, any change of pipeline parties,
+        stage or protocol kind rebuilds every task.
+        """
         party_spec = parties.get_parties_spec()
+        cache_key = (party_spec, stage, protocol_kind)
+        if cache_key != self._cache_key:
+            self._task_cache = dict()
+            self._cache_key = cache_key
+
+        task_cache = dict()
         tasks = dict()
         party_tasks = dict()
         for task_name, task_inst in task_insts.items():
-            task = dict(component_ref=task_inst.component_ref)
-            dependent_tasks = task_inst.get_dependent_tasks()
-
             cpn_runtime_parties = task_inst.support_parties.get_party_inst_by_role(parties.get_runtime_roles())
             if not len(cpn_runtime_parties):
                 cpn_runtime_parties = parties.get_party_inst_by_role(task_inst.support_roles)
 
-            if cpn_runtime_parties != parties:
-                task["parties"] = cpn_runtime_parties.get_parties_spec()
-
-            input_channels, input_artifacts = task_inst.get_runtime_input_artifacts(cpn_runtime_parties)
-            if task_inst.stage is None:
-                task_stage = ComponentStageSchedule.get_stage(input_artifacts, default_stage='default')
+            task_key = (task_inst, task_inst.revision, cpn_runtime_parties.get_parties_spec())
+            if task_name in self._task_cache and self._task_cache[task_name][0] == task_key:
+                task_cache[task_name] = self._task_cache[task_name]
             else:
-                task_stage = task_inst.stage
-
-            if input_channels:
-                inputs = RuntimeInputArtifacts(**input_channels)
-                task["inputs"] = inputs
-
-            task["outputs"] = task_inst.get_output_artifacts()
-
-            if dependent_tasks:
-                task["dependent_tasks"] = dependent_tasks
-
-            if task_inst.conf.dict():
-                if "conf" not in task:
-                    task["conf"] = dict()
-                task["conf"].update(task_inst.conf.dict())
-
-            common_parameters = task_inst.get_task_parameters()
-
-            for role, party_id_list in cpn_runtime_parties:
-                for idx, party_id in enumerate(party_id_list):
-                    role_party_key = f"{role}_{party_id}"
-                    role_parameters = task_inst.get_role_parameters(role, idx)
-                    if role_parameters:
-                        if role_party_key not in party_tasks:
-                            party_tasks[role_party_key] = PartyTaskSpec(
-                                parties=[PartySpec(role=role, party_id=[party_id])],
-                                tasks=dict()
-                            )
-
-                        party_tasks[role_party_key].tasks[task_name] = PartyTaskRefSpec(
-                            parameters=role_parameters
-                        )
-
-                    task_role_conf = task_inst.get_role_conf(role, idx)
-                    if task_role_conf:
-                        if role_party_key not in party_tasks:
-                            party_tasks[role_party_key] = PartyTaskSpec(
-                                parties=[PartySpec(role=role, party_id=[party_id])],
-                                tasks=dict()
-                            )
-
-                        if task_name not in party_tasks[role_party_key].tasks:
-                            party_tasks[role_party_key].tasks[task_name] = PartyTaskRefSpec(
-                                conf=task_role_conf
-                            )
-                        else:
-                            party_tasks[role_party_key].tasks[task_name].conf = task_role_conf
-
-            if task_stage != stage:
-                task["stage"] = task_stage
-            task["parameters"] = common_parameters
-
-            tasks[task_name] = TaskSpec(**task)
+                task_spec, party_task_refs = self._compile_task(parties, task_inst, stage, cpn_runtime_parties)
+                task_cache[task_name] = (task_key, task_spec, party_task_refs)
+
+            _, tasks[task_name], party_task_refs = task_cache[task_name]
+            for role_party_key, (role, party_id, party_task_ref) in party_task_refs.items():
+                if role_party_key not in party_tasks:
+                    party_tasks[role_party_key] = PartyTaskSpec(
+                        parties=[PartySpec(role=role, party_id=[party_id])],
+                        tasks=dict()
+                    )
+                party_tasks[role_party_key].tasks[task_name] = party_task_ref
+
+        self._task_cache = task_cache
 
         self._dag_spec = DAGSpec(
             parties=party_spec,
@@ -134,19 +102,78 @@ class DAG(object):
         self._is_compiled = True
 
         self._dag_spec = post_process(protocol_kind, self._dag_spec, task_insts)
+        self._dag_schema = None
+
+    @staticmethod
+    def _compile_task(parties, task_inst, stage, cpn_runtime_parties):
+        """
+        Returns:
+            (TaskSpec, party task refs), refs are ordered dict role_party_key -> (role, party_id, PartyTaskRefSpec)
+        """
+        task = dict(component_ref=task_inst.component_ref)
+        dependent_tasks = task_inst.get_dependent_tasks()
+
+        if cpn_runtime_parties != parties:
+            task["parties"] = cpn_runtime_parties.get_parties_spec()
+
+        input_channels, input_artifacts = task_inst.get_runtime_input_artifacts(cpn_runtime_parties)
+        if task_inst.stage is None:
+            task_stage = ComponentStageSchedule.get_stage(input_artifacts, default_stage='default')
+        else:
+            task_stage = task_inst.stage
+
+        if input_channels:
+            inputs = RuntimeInputArtifacts(**input_channels)
+            task["inputs"] = inputs
+
+        task["outputs"] = task_inst.get_output_artifacts()
+
+        if dependent_tasks:
+            task["dependent_tasks"] = dependent_tasks
+
+        if task_inst.conf.dict():
+            if "conf" not in task:
+                task["conf"] = dict()
+            task["conf"].update(task_inst.conf.dict())
+
+        common_parameters = task_inst.get_task_parameters()
+        party_index = task_inst.get_party_index()
+        party_task_refs = dict()
+
+        for role, party_id_list in cpn_runtime_parties:
+            for idx, party_id in enumerate(party_id_list):
+                role_party_key = f"{role}_{party_id}"
+                role_parameters, task_role_conf = party_index.get((role, str(idx)), (None, None))
+                if role_parameters:
+                    party_task_refs[role_party_key] = (role, party_id, PartyTaskRefSpec(
+                        parameters=role_parameters
+                    ))
+
+                if task_role_conf:
+                    if role_party_key not in party_task_refs:
+                        party_task_refs[role_party_key] = (role, party_id, PartyTaskRefSpec(
+                            conf=task_role_conf
+                        ))
+                    else:
+                        party_task_refs[role_party_key][2].conf = task_role_conf
+
+        if task_stage != stage:
+            task["stage"] = task_stage
+        task["parameters"] = common_parameters
+
+        return TaskSpec(**task), party_task_refs
 
 
 def post_process(protocol_kind, pre_dag_spec: DAGSpec, task_insts):
     def _default_post_process(dag_spec: DAGSpec):
-        post_dag_spec = copy.deepcopy(dag_spec)
-        for task in post_dag_spec.tasks:
-            if post_dag_spec.tasks[task].outputs:
-                post_dag_spec.tasks[task].outputs = None
-
-            if not post_dag_spec.tasks[task].conf:
-                continue
+        """
+        tasks are shallow copies without outputs, everything else is shared with dag_spec
+        """
+        tasks = dict()
+        for task_name, task_spec in dag_spec.tasks.items():
+            tasks[task_name] = task_spec.copy(update=dict(outputs=None)) if task_spec.outputs else task_spec
 
-        return post_dag_spec
+        return dag_spec.copy(update=dict(tasks=tasks))
 
     if protocol_kind == "fate":
         return _default_post_process(pre_dag_spec)
@@ -12,7 +12,7 @@
 #  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 from typing import Optional, Literal, List, Union, Dict, Any, TypeVar
 
 
@@ -150,3 +150,14 @@ class DAGSchema(BaseModel):
     dag: DAGSpec
     schema_version: str
     kind: str = "fate"
+
+    _export: Optional[dict] = PrivateAttr(default=None)
+
+    def export(self) -> dict:
+        """
+        Submission dict of the schema, same as dict(exclude_defaults=True) but computed only once,
+        so the schema should not be modified after it is exported, the returned dict should not be modified either
+        """
+        if self._export is None:
+            self._export = self.dict(exclude_defaults=True)
+        return self._export
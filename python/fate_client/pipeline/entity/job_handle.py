@@ -0,0 +1,185 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, List
+
+from .model_info import FateFlowModelInfo
+from ..utils.fateflow.fate_flow_job_invoker import FATEFlowJobInvoker
+from ..utils.fateflow.job_monitor import JobMonitor, JobMonitorPool, JobStatus, JobStatusSnapshot, PollingPolicy
+
+logger = logging.getLogger(__name__)
+
+_job_monitor_pool = None
+_job_monitor_pool_lock = threading.Lock()
+# done callbacks of watched jobs run here, so a slow callback does not hold up the pool's polling thread
+_callback_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="job_handle_callback")
+
+
+def get_job_monitor_pool(flow_job_invoker: FATEFlowJobInvoker) -> JobMonitorPool:
+    """
+    Process-wide pool watching jobs of JobHandles with done callbacks, created with the first caller's invoker
+    """
+    global _job_monitor_pool
+    with _job_monitor_pool_lock:
+        if _job_monitor_pool is None:
+            _job_monitor_pool = JobMonitorPool(flow_job_invoker)
+
+    return _job_monitor_pool
+
+
+class JobHandle(object):
+    """
+    Handle of a submitted job, returned by Pipeline.fit_async / Pipeline.predict_async.
+    With watch=True, the job is watched by the process-wide JobMonitorPool once a done callback is added, so
+    callbacks run when the job finishes even if nobody waits on the handle. With watch=False callbacks only run
+    from wait / status / result, for callers which block on the job anyway.
+    """
+    def __init__(self, flow_job_invoker: FATEFlowJobInvoker, job_id: str, local_role: str, local_party_id: str,
+                 model_id: str = None, model_version: str = None, polling_policy: PollingPolicy = None,
+                 watch: bool = True):
+        self._invoker = flow_job_invoker
+        self._polling_policy = polling_policy
+        self._watch = watch
+        self._model_info = FateFlowModelInfo(job_id=job_id,
+                                             local_role=local_role,
+                                             local_party_id=local_party_id,
+                                             model_id=model_id,
+                                             model_version=model_version)
+        self._final_snapshot = None
+        self._done_callbacks = []
+        self._watch_future = None
+        self._callbacks_done = threading.Event()
+        self._finishing_thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def job_id(self):
+        return self._model_info.job_id
+
+    @property
+    def model_id(self):
+        return self._model_info.model_id
+
+    @property
+    def model_version(self):
+        return self._model_info.model_version
+
+    def add_done_callback(self, fn: Callable[[FateFlowModelInfo], None]):
+        """
+        fn is called with the FateFlowModelInfo once the job finishes successfully, from the thread that
+        notices it: the JobMonitorPool thread, or the caller of wait / status / result
+        """
+        with self._lock:
+            if self._final_snapshot is None:
+                self._done_callbacks.append(fn)
+                watch = self._watch and self._watch_future is None
+                if watch:
+                    self._watch_future = get_job_monitor_pool(self._invoker).add_job(
+                        self.job_id, self._model_info.local_role, self._model_info.local_party_id)
+            else:
+                watch = None
+
+        if watch is None:
+            if self._final_snapshot.status == JobStatus.SUCCESS:
+                fn(self._model_info)
+        elif watch:
+            self._watch_future.add_done_callback(self._on_watch_done)
+
+    def _on_watch_done(self, future):
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            logger.warning(f"job monitor pool stopped watching job {self.job_id}: {future.exception()}, "
+                           f"done callbacks run on the next wait / status / result call")
+            with self._lock:
+                self._watch_future = None
+            return
+
+        _callback_executor.submit(self._finish_in_background, future.result())
+
+    def _finish_in_background(self, snapshot: JobStatusSnapshot):
+        try:
+            self._finish(snapshot)
+        except Exception:
+            logger.exception(f"done callback of job {self.job_id} failed")
+
+    def done(self) -> bool:
+        return self._final_snapshot is not None
+
+    def status(self) -> str:
+        if self._final_snapshot is not None:
+            return self._final_snapshot.status
+
+        status = self._invoker.query_job(self.job_id, self._model_info.local_role,
+                                         self._model_info.local_party_id)["status"]
+        if JobStatus.is_end_status(status):
+            self._finish(JobStatusSnapshot(self.job_id, status))
+
+        return status
+
+    def wait(self, timeout: float = None, listeners: List[Callable] = None) -> str:
+        """
+        Block until job finishes and return its end status, raise TimeoutError if timeout seconds elapse first.
+        A job already watched by the JobMonitorPool is waited on through the pool unless listeners are given,
+        so it is not polled twice
+        """
+        watch_future = self._watch_future
+        if self._final_snapshot is None and watch_future is not None and not listeners:
+            try:
+                self._finish(watch_future.result(timeout=timeout))
+            except FutureTimeoutError:
+                raise TimeoutError(f"Job {self.job_id} does not finish in {timeout} seconds")
+            except Exception as e:
+                logger.warning(f"job monitor pool failed to watch job {self.job_id}: {e}, poll it directly")
+
+        if self._final_snapshot is None:
+            job_monitor = JobMonitor(self._invoker, polling_policy=self._polling_policy, listeners=listeners)
+            self._finish(job_monitor.watch(self.job_id, self._model_info.local_role,
+                                           self._model_info.local_party_id, timeout=timeout))
+
+        if threading.current_thread() is not self._finishing_thread:
+            self._callbacks_done.wait()
+        return self._final_snapshot.status
+
+    def cancel(self):
+        return self._invoker.stop_job(self.job_id)
+
+    def result(self, timeout: float = None) -> FateFlowModelInfo:
+        status = self.wait(timeout=timeout)
+        if status != JobStatus.SUCCESS:
+            raise ValueError(f"Job is {status}, please check out job_id={self.job_id} in fate_flow log directory")
+
+        return self._model_info
+
+    def _finish(self, snapshot: JobStatusSnapshot):
+        with self._lock:
+            if self._final_snapshot is not None:
+                return
+            self._final_snapshot = snapshot
+            self._finishing_thread = threading.current_thread()
+            done_callbacks, self._done_callbacks = self._done_callbacks, []
+
+        try:
+            if snapshot.status == JobStatus.SUCCESS:
+                for fn in done_callbacks:
+                    fn(self._model_info)
+        finally:
+            self._callbacks_done.set()
+
+    def __repr__(self):
+        return f"JobHandle(job_id={self.job_id}, model_id={self.model_id}, model_version={self.model_version})"
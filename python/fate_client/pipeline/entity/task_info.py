@@ -15,6 +15,8 @@
 import abc
 from .model_info import FateFlowModelInfo
 from ..utils.fateflow.fate_flow_job_invoker import FATEFlowJobInvoker
+from ..utils.fateflow.output_cache import get_output_cache
+from fate_client.flow_sdk.utils.output_data import DEFAULT_CHUNK_SIZE
 
 
 class TaskInfo(object):
@@ -26,6 +28,10 @@ class TaskInfo(object):
     def get_output_data(self, *args, **kwargs):
         ...
 
+    @abc.abstractmethod
+    def iter_output_data(self, *args, **kwargs):
+        ...
+
     @abc.abstractmethod
     def get_output_model(self, *args, **kwargs):
         ...
@@ -36,23 +42,56 @@ class TaskInfo(object):
 
 
 class FateFlowTaskInfo(TaskInfo):
-    def get_output_model(self):
+    def get_output_model(self, use_cache=True):
         return FATEFlowJobInvoker().get_output_model(job_id=self._model_info.job_id,
                                                      role=self._model_info.local_role,
                                                      party_id=self._model_info.local_party_id,
-                                                     task_name=self._task_name)
+                                                     task_name=self._task_name,
+                                                     output_cache=get_output_cache() if use_cache else None)
 
-    def get_output_data(self):
+    def get_output_data(self, use_cache=True, expand_predict_detail=False, materialize=None, columns=None):
+        """
+        Args:
+            use_cache: read from and store into local output cache, if pipeline.output_cache is enabled in settings.yaml
+            expand_predict_detail: expand predict_detail to float columns
+            materialize: "parquet" or "feather", convert downloaded csv once into this format and load from it,
+                needs pyarrow
+            columns: list of column names to load, None to load all
+        """
         return FATEFlowJobInvoker().get_output_data(job_id=self._model_info.job_id,
                                                     role=self._model_info.local_role,
                                                     party_id=self._model_info.local_party_id,
-                                                    task_name=self._task_name)
+                                                    task_name=self._task_name,
+                                                    output_cache=get_output_cache() if use_cache else None,
+                                                    expand_predict_detail=expand_predict_detail,
+                                                    materialize=materialize,
+                                                    columns=columns)
+
+    def iter_output_data(self, output_key=None, chunksize=DEFAULT_CHUNK_SIZE, columns=None, use_cache=True,
+                         expand_predict_detail=False):
+        """
+        Iterate output data chunk by chunk, each item is (output_key, pandas.DataFrame of at most chunksize rows)
+
+        Args:
+            output_key: only yield this output, e.g. "train_output_data", None to yield all
+            chunksize: max rows of each chunk
+            columns: list of column names to keep, None to keep all
+            use_cache: read from local output cache if it is enabled and the data is cached
+            expand_predict_detail: expand predict_detail to float columns
+        """
+        return FATEFlowJobInvoker().iter_output_data(job_id=self._model_info.job_id,
+                                                     role=self._model_info.local_role,
+                                                     party_id=self._model_info.local_party_id,
+                                                     task_name=self._task_name,
+                                                     output_key=output_key,
+                                                     chunksize=chunksize,
+                                                     columns=columns,
+                                                     output_cache=get_output_cache() if use_cache else None,
+                                                     expand_predict_detail=expand_predict_detail)
 
-    def get_output_metric(self):
+    def get_output_metric(self, use_cache=True):
         return FATEFlowJobInvoker().get_output_metric(job_id=self._model_info.job_id,
                                                       role=self._model_info.local_role,
                                                       party_id=self._model_info.local_party_id,
-                                                      task_name=self._task_name)
-
-
-
+                                                      task_name=self._task_name,
+                                                      output_cache=get_output_cache() if use_cache else None)
@@ -17,8 +17,11 @@ from typing import Dict
 from ..entity.dag_structures import DAGSchema
 from ..entity.component_structures import ComponentSpec
 from ..utils.fateflow.fate_flow_job_invoker import FATEFlowJobInvoker
+from ..utils.fateflow.job_monitor import ConsoleJobListener
+from ..utils.fateflow.upload_index import get_upload_index
 from ..utils.callbacks import CallbackHandler
 from ..entity.model_info import FateFlowModelInfo
+from ..entity.job_handle import JobHandle
 
 
 class FateFlowExecutor(object):
@@ -27,71 +30,93 @@ class FateFlowExecutor(object):
 
     def fit(self, dag_schema: DAGSchema, component_specs: Dict[str, ComponentSpec],
             local_role: str, local_party_id: str, callback_handler: CallbackHandler) -> FateFlowModelInfo:
+        job_handle = self.fit_async(dag_schema, component_specs, local_role, local_party_id, callback_handler,
+                                    watch=False)
+
+        return self._wait(job_handle)
+
+    def fit_async(self, dag_schema: DAGSchema, component_specs: Dict[str, ComponentSpec],
+                  local_role: str, local_party_id: str, callback_handler: CallbackHandler,
+                  watch: bool = True) -> JobHandle:
         flow_job_invoker = FATEFlowJobInvoker()
         local_party_id = self.get_site_party_id(flow_job_invoker, dag_schema, local_role, local_party_id)
 
-        return self._run(
+        return self._submit(
             dag_schema,
             local_role,
             local_party_id,
             flow_job_invoker,
             callback_handler,
-            event="fit"
+            event="fit",
+            watch=watch
         )
 
     def predict(self,
                 dag_schema: DAGSchema,
                 component_specs: Dict[str, ComponentSpec],
                 fit_model_info: FateFlowModelInfo, callback_handler: CallbackHandler) -> FateFlowModelInfo:
+        job_handle = self.predict_async(dag_schema, component_specs, fit_model_info, callback_handler, watch=False)
+
+        return self._wait(job_handle)
+
+    def predict_async(self,
+                      dag_schema: DAGSchema,
+                      component_specs: Dict[str, ComponentSpec],
+                      fit_model_info: FateFlowModelInfo, callback_handler: CallbackHandler,
+                      watch: bool = True) -> JobHandle:
         flow_job_invoker = FATEFlowJobInvoker()
         schedule_role = fit_model_info.local_role
         schedule_party_id = fit_model_info.local_party_id
 
-        return self._run(
+        return self._submit(
             dag_schema,
             schedule_role,
             schedule_party_id,
             flow_job_invoker,
             callback_handler,
-            event="predict"
+            event="predict",
+            watch=watch
         )
 
-    def _run(self,
-             dag_schema: DAGSchema,
-             local_role,
-             local_party_id,
-             flow_job_invoker: FATEFlowJobInvoker,
-             callback_handler: CallbackHandler,
-             event="fit") -> FateFlowModelInfo:
-
-        job_id, model_id, model_version = flow_job_invoker.submit_job(dag_schema.dict(exclude_defaults=True))
-
-        getattr(callback_handler, f"on_{event}_begin")(
-            job_info=dict(
-                job_id=job_id,
-                model_id=model_id,
-                model_version=model_version
-            )
+    @staticmethod
+    def _submit(dag_schema: DAGSchema,
+                local_role,
+                local_party_id,
+                flow_job_invoker: FATEFlowJobInvoker,
+                callback_handler: CallbackHandler,
+                event="fit",
+                watch=True) -> JobHandle:
+
+        job_id, model_id, model_version = flow_job_invoker.submit_job(dag_schema.export())
+        job_info = dict(
+            job_id=job_id,
+            model_id=model_id,
+            model_version=model_version
         )
 
-        flow_job_invoker.monitor_status(job_id, local_role, local_party_id)
+        getattr(callback_handler, f"on_{event}_begin")(job_info=job_info)
 
-        getattr(callback_handler, f"on_{event}_end")(
-            job_info=dict(
-                job_id=job_id,
-                model_id=model_id,
-                model_version=model_version
-            )
-        )
-
-        return FateFlowModelInfo(
+        job_handle = JobHandle(
+            flow_job_invoker,
             job_id=job_id,
             local_role=local_role,
             local_party_id=local_party_id,
             model_id=model_id,
-            model_version=model_version
+            model_version=model_version,
+            watch=watch
+        )
+        job_handle.add_done_callback(
+            lambda model_info: getattr(callback_handler, f"on_{event}_end")(job_info=job_info)
         )
 
+        return job_handle
+
+    @staticmethod
+    def _wait(job_handle: JobHandle) -> FateFlowModelInfo:
+        job_handle.wait(listeners=[ConsoleJobListener()])
+
+        return job_handle.result()
+
     @staticmethod
     def get_site_party_id(flow_job_invoker, dag_schema, role, party_id):
         site_party_id = flow_job_invoker.query_site_info()
@@ -132,6 +157,7 @@ class FateFlowExecutor(object):
             party_id=party_id,
             namespace=namespace,
             name=name,
+            upload_index=get_upload_index(),
             **kwargs)
 
     @staticmethod
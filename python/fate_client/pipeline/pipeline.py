@@ -15,11 +15,11 @@
 import copy
 import uuid
 from types import SimpleNamespace
-from ruamel import yaml
 from .executor import FateFlowExecutor
 from .entity import DAG
 from .entity.dag_structures import JobConfSpec, ModelWarehouseConfSpec
 from .entity import FateFlowTaskInfo
+from .entity.job_handle import JobHandle
 from .entity.runtime_entity import Parties
 from .conf.env_config import SiteInfo
 from .conf.types import SupportRole, PlaceHolder, InputArtifactType
@@ -27,6 +27,7 @@ from .conf.job_configuration import JobConf
 from .components.component_base import Component
 from .scheduler.dag_parser import DagParser
 from .utils.callbacks import CallbackHandler, JobInfoCallBack
+from .utils.serializer import serialize
 
 
 class Pipeline(object):
@@ -182,9 +183,10 @@ class Pipeline(object):
 
     def compile(self) -> "Pipeline":
         party_confs = dict()
+        party_conf_index = self._get_party_conf_index()
         for role, party_id_list in self._parties:
             for idx, party_id in enumerate(party_id_list):
-                conf = self._get_role_conf(role, idx)
+                conf = party_conf_index.get((role, str(idx)))
                 if not conf:
                     continue
 
@@ -247,8 +249,15 @@ class Pipeline(object):
 
         return deploy_pipeline
 
-    def get_dag(self):
-        return yaml.safe_dump(self._dag.dag_spec.dict(exclude_defaults=True))
+    def get_dag(self, serializer="yaml"):
+        """
+        Args:
+            serializer: yaml, yaml_c or json, json is canonical and much faster for large DAGs, see utils.serializer
+
+        Returns:
+            serialized dag
+        """
+        return serialize(self._dag.dag_spec.export(), serializer=serializer)
 
     def get_component_specs(self):
         component_specs = dict()
@@ -269,6 +278,20 @@ class Pipeline(object):
 
         return self
 
+    def fit_async(self) -> JobHandle:
+        """
+        Submit training job and return its JobHandle without waiting,
+        model_info of pipeline is set once the job finishes successfully
+        """
+        job_handle = self._executor.fit_async(self._dag.dag_spec,
+                                              self.get_component_specs(),
+                                              local_role=self._local_role,
+                                              local_party_id=self._local_party_id,
+                                              callback_handler=self._callback_handler)
+        job_handle.add_done_callback(self._set_model_info)
+
+        return job_handle
+
     def predict(self) -> "Pipeline":
         self._model_info = self._executor.predict(self._dag.dag_spec,
                                                   self.get_component_specs(),
@@ -277,10 +300,23 @@ class Pipeline(object):
 
         return self
 
-    def deploy(self, task_list=None):
+    def predict_async(self) -> JobHandle:
+        job_handle = self._executor.predict_async(self._dag.dag_spec,
+                                                  self.get_component_specs(),
+                                                  self._model_info,
+                                                  callback_handler=self._callback_handler)
+        job_handle.add_done_callback(self._set_model_info)
+
+        return job_handle
+
+    def _set_model_info(self, model_info):
+        self._model_info = model_info
+
+    def deploy(self, task_list=None, serializer="yaml"):
         """
         this will return predict dag IR
         if component_list is None: deploy all
+        serializer: yaml, yaml_c or json, format of the returned predict dag
         """
         if self._stage != "train":
             raise ValueError(f"Only training pipeline can be deployed, but this pipeline's stage is {self._stage}")
@@ -303,7 +339,7 @@ class Pipeline(object):
             self._predict_dag.conf.model_warehouse = ModelWarehouseConfSpec(model_id=self._model_info.model_id,
                                                                             model_version=self._model_info.model_version)
 
-        return yaml.dump(self._predict_dag.dict(exclude_defaults=True))
+        return serialize(self._predict_dag.dict(exclude_defaults=True), serializer=serializer)
 
     def _get_party_pipeline(self, role) -> "Pipeline":
         if role not in self._parties.get_runtime_roles():
@@ -335,23 +371,16 @@ class Pipeline(object):
     def arbiter(self):
         return self._get_party_pipeline(role="arbiter")[0]
 
-    def _get_role_conf(self, role, index):
-        conf = dict()
-        if role not in self.__party_pipeline:
-            return conf
-
-        index = str(index)
-        role_pipeline_dict = self.__party_pipeline[role]
-
-        for _, party_pipeline in role_pipeline_dict.items():
-            for party_index, party_inst in party_pipeline.__party_pipeline.items():
-                party_index = party_index.split("|")
-                if index not in party_index:
-                    continue
-
-                conf.update(party_inst.conf.dict())
+    def _get_party_conf_index(self):
+        party_conf_index = dict()
+        for role, role_pipeline_dict in self.__party_pipeline.items():
+            for _, party_pipeline in role_pipeline_dict.items():
+                for party_key, party_inst in party_pipeline.__party_pipeline.items():
+                    conf = party_inst.conf.dict()
+                    for index in party_key.split("|"):
+                        party_conf_index.setdefault((role, index), dict()).update(conf)
 
-        return conf
+        return party_conf_index
 
     def __getattr__(self, attr):
         if attr in self._tasks:
@@ -394,9 +423,22 @@ class FateFlowPipeline(Pipeline):
                                           name: str,
                                           meta: dict,
                                           extend_sid=True,
-                                          partitions=4
+                                          partitions=4,
+                                          progress_callback=None,
+                                          compress=False,
+                                          force_refresh=False
                                           ):
-        self._executor.upload(
+        """
+        progress_callback(sent_bytes, total_bytes) is called while the file is uploaded, compress=True gzips
+        the file before upload.
+        If pipeline.upload_dedup is enabled in settings.yaml, uploading is skipped when the table was uploaded
+        from this machine with the same file, meta, head and extend_sid and still exists, force_refresh=True
+        uploads anyway.
+
+        Returns:
+            True if the file is uploaded, False if uploading is skipped
+        """
+        return self._executor.upload(
             file=file,
             head=head,
             meta=meta,
@@ -405,7 +447,10 @@ class FateFlowPipeline(Pipeline):
             role="local",
             party_id="0",
             namespace=namespace,
-            name=name
+            name=name,
+            progress_callback=progress_callback,
+            compress=compress,
+            force_refresh=force_refresh
         )
 
     def bind_local_path(self, path, namespace, name):
@@ -13,62 +13,37 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 #
+import logging
 import os
 import tempfile
-import time
-from datetime import timedelta
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 
 from fate_client.flow_sdk import FlowClient
+from fate_client.flow_sdk.utils.io_utils import iter_tar_members
+from fate_client.flow_sdk.utils.output_data import DEFAULT_CHUNK_SIZE, OUTPUT_FILE_SUFFIXES, iter_output_csv, \
+    materialize_output_dir, read_output_csv, read_output_file
 from ...conf.env_config import FlowConfig
+from .job_monitor import JobMonitor, JobStatus, PollingPolicy, ConsoleJobListener
+from .output_cache import OutputCache, OutputCacheKey
+from .upload_index import UploadIndex
+
+logger = logging.getLogger(__name__)
 
 
 class FATEFlowJobInvoker(object):
     def __init__(self):
         self._client = FlowClient(ip=FlowConfig.IP, port=FlowConfig.PORT, version=FlowConfig.VERSION)
 
-    def monitor_status(self, job_id, role, party_id):
-        start_time = time.time()
-        pre_task = None
-        print(f"Job id is {job_id}\n")
-        while True:
-            response_data = self.query_job(job_id, role, party_id)
-            status = response_data["status"]
-            if status == JobStatus.SUCCESS:
-                elapse_seconds = timedelta(seconds=int(time.time() - start_time))
-                print(f"Job is success!!! Job id is {job_id}, response_data={response_data}")
-                print(f"Total time: {elapse_seconds}")
-                break
-
-            elif status == JobStatus.RUNNING:
-                code, data = self.query_task(job_id=job_id, role=role, party_id=party_id,
-                                             status=JobStatus.RUNNING)
-
-                if code != 0 or len(data) == 0:
-                    time.sleep(0.1)
-                    continue
-
-                elapse_seconds = timedelta(seconds=int(time.time() - start_time))
-                if len(data) == 1:
-                    task = data[0]["task_name"]
-                else:
-                    task = []
-                    for task_data in data:
-                        task.append(task_data["task_name"])
+    def monitor_status(self, job_id, role, party_id, polling_policy: PollingPolicy = None, listeners=None):
+        if listeners is None:
+            listeners = [ConsoleJobListener()]
 
-                if task != pre_task:
-                    print(f"\r")
-                    pre_task = task
-                print(f"\x1b[80D\x1b[1A\x1b[KRunning task {task}, time elapse: {elapse_seconds}")
+        job_monitor = JobMonitor(self, polling_policy=polling_policy, listeners=listeners)
+        snapshot = job_monitor.watch(job_id, role, party_id)
+        if snapshot.status != JobStatus.SUCCESS:
+            raise ValueError(f"Job is {snapshot.status}, please check out job_id={job_id} in fate_flow log directory")
 
-            elif status == JobStatus.WAITING:
-                elapse_seconds = timedelta(seconds=int(time.time() - start_time))
-                print(f"\x1b[80D\x1b[1A\x1b[KJob is waiting, time elapse: {elapse_seconds}")
-
-            elif status in [JobStatus.FAILED, JobStatus.CANCELED]:
-                raise ValueError(f"Job is {status}, please check out job_id={job_id} in fate_flow log directory")
-
-            time.sleep(1)
+        return snapshot
 
     def submit_job(self, dag_schema):
         response = self._client.job.submit(dag_schema=dag_schema)
@@ -84,6 +59,17 @@ class FATEFlowJobInvoker(object):
         except BaseException:
             raise ValueError(f"submit job is failed, response={response}")
 
+    def stop_job(self, job_id):
+        response = self._client.job.stop(job_id=job_id)
+        try:
+            code = response["code"]
+            if code != 0:
+                raise ValueError(f"Return code {code}!=0")
+
+            return response
+        except BaseException:
+            raise ValueError(f"stop job is failed, response={response}")
+
     def query_job(self, job_id, role, party_id):
         response = self._client.job.query(job_id, role, party_id)
         try:
@@ -96,6 +82,18 @@ class FATEFlowJobInvoker(object):
         except BaseException:
             raise ValueError(f"query job is failed, response={response}")
 
+    def query_job_list(self, role=None, party_id=None, limit=None, page=None, status=None):
+        response = self._client.job.query_job_list(role=role, party_id=party_id, limit=limit, page=page,
+                                                   status=status)
+        try:
+            code = response["code"]
+            if code != 0:
+                raise ValueError(f"Return code {code}!=0")
+
+            return response["data"]["data"]
+        except BaseException:
+            raise ValueError(f"query job list is failed, response={response}")
+
     def query_task(self, job_id, role, party_id, status):
         response = self._client.task.query(job_id=job_id, role=role, party_id=party_id, status=status)
         try:
@@ -127,9 +125,31 @@ class FATEFlowJobInvoker(object):
         except BaseException:
             raise ValueError(f"bind path fails, response={response}")
 
+    def table_exists(self, namespace, name):
+        response = self._client.table.query(namespace=namespace, name=name)
+        try:
+            return response["code"] == 0 and bool(response.get("data"))
+        except BaseException:
+            return False
+
     def upload_file_and_convert_to_dataframe(
             self, file, meta, head, extend_sid,
-            namespace, name, role=None, party_id=None, **kwargs):
+            namespace, name, role=None, party_id=None, upload_index: UploadIndex = None, force_refresh=False,
+            **kwargs):
+        """
+        Returns:
+            True if the file is uploaded, False if upload_index shows the table was already uploaded from the
+            same file and it still exists
+        """
+        fingerprint = None
+        if upload_index is not None:
+            fingerprint = upload_index.fingerprint(file, meta=meta, head=head, extend_sid=extend_sid, **kwargs)
+            if not force_refresh and upload_index.contains(fingerprint, namespace, name) \
+                    and self.table_exists(namespace, name):
+                logger.info(f"table namespace={namespace}, name={name} is already uploaded from the same file, "
+                            f"skip it")
+                return False
+
         response = self._client.data.upload_file(file=file,
                                                  head=head,
                                                  meta=meta,
@@ -146,107 +166,197 @@ class FATEFlowJobInvoker(object):
         except BaseException:
             raise ValueError(f"Upload data fails, response={response}")
 
+        if upload_index is not None:
+            upload_index.discard(namespace, name)
         self.monitor_status(job_id, role=role, party_id=party_id)
+        if upload_index is not None:
+            upload_index.record(fingerprint, namespace, name)
+
+        return True
+
+    def get_output_data(self, job_id, role, party_id, task_name, output_cache: OutputCache = None,
+                        expand_predict_detail=False, materialize=None, columns=None):
+        """
+        Load output data of a task as {output_key: DataFrame}, or {output_key: {file_name: DataFrame}} when an
+        output has several files.
+        If materialize is "parquet" or "feather", csv files are converted once to that format (predict_detail
+        expanded to float columns), later loads read the converted files and only the requested columns
+        """
+        cache_key = OutputCacheKey(job_id, role, party_id, task_name, None)
+        memory_kind = ("data", expand_predict_detail, materialize, tuple(columns) if columns else None)
+        if output_cache is not None:
+            output_data_dict = output_cache.get_memory(memory_kind, cache_key)
+            if output_data_dict is not None:
+                return output_data_dict
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            if materialize:
+                columnar_kind = f"data_{materialize}"
+                data_dir = output_cache.get_dir(columnar_kind, cache_key) if output_cache is not None else None
+                cacheable = data_dir is not None
+                if data_dir is None:
+                    csv_dir, cacheable = self._get_output_data_dir(job_id, role, party_id, task_name,
+                                                                   output_cache, tmp_dir)
+                    data_dir = Path(tmp_dir).joinpath(columnar_kind)
+                    materialize_output_dir(csv_dir, data_dir, fmt=materialize)
+                    if cacheable:
+                        cached_dir = output_cache.put_dir(columnar_kind, cache_key, data_dir, move=True)
+                        if cached_dir is not None:
+                            data_dir = cached_dir
+            else:
+                data_dir, cacheable = self._get_output_data_dir(job_id, role, party_id, task_name,
+                                                                output_cache, tmp_dir)
+
+            output_data_dict = self._load_output_data(data_dir, expand_predict_detail, columns)
+            if cacheable:
+                output_cache.put_memory(memory_kind, cache_key, output_data_dict)
 
-    def get_output_data(self, job_id, role, party_id, task_name):
-        with tempfile.TemporaryDirectory() as data_dir:
-            response = self._client.output.download_data(job_id=job_id, role=role, party_id=party_id,
-                                                         task_name=task_name, path=data_dir)
-            try:
-                code = response["code"]
-                if code != 0:
-                    raise ValueError(f"Return code {code}!=0")
-            except BaseException:
-                raise ValueError(f"query task={job_id}, role={role}, "
-                                 f"party_id={party_id}'s output data is failed, response={response}")
-
-            data_dir = Path(data_dir).joinpath(os.listdir(data_dir)[0])
-            output_keys = os.listdir(data_dir)
-            if not output_keys:
-                return None
+            return output_data_dict
 
-            output_data_dict = {}
-            for output_key in output_keys:
-                path = Path(data_dir).joinpath(output_key)
-                files = os.listdir(path)
-                file_names = []
-                for file in files:
-                    if file.endswith("csv"):
-                        file_names.append(file)
-
-                if len(file_names) == 1:
-                    output_data_dict[output_key] = self.load_data_to_pd_df(path.joinpath(file_names[0]))
-                else:
-                    output_data_dict[output_key] = dict()
-                    for file_name in file_names:
-                        output_data_dict[output_key][file_name] = self.load_data_to_pd_df(path.joinpath(file_name))
+    def _get_output_data_dir(self, job_id, role, party_id, task_name, output_cache: OutputCache, tmp_dir):
+        """
+        Returns:
+            (directory of output csv files, whether the outputs may be kept in output_cache)
+        """
+        cache_key = OutputCacheKey(job_id, role, party_id, task_name, None)
+        if output_cache is not None:
+            data_dir = output_cache.get_dir("data", cache_key)
+            if data_dir is not None:
+                return data_dir, True
+
+        response = self._client.output.download_data(job_id=job_id, role=role, party_id=party_id,
+                                                     task_name=task_name, path=tmp_dir)
+        try:
+            code = response["code"]
+            if code != 0:
+                raise ValueError(f"Return code {code}!=0")
+        except BaseException:
+            raise ValueError(f"query task={job_id}, role={role}, "
+                             f"party_id={party_id}'s output data is failed, response={response}")
+
+        data_dir = Path(tmp_dir).joinpath(os.listdir(tmp_dir)[0])
+        if output_cache is not None and self._is_job_success(job_id, role, party_id):
+            cached_dir = output_cache.put_dir("data", cache_key, data_dir, move=True)
+            if cached_dir is not None:
+                return cached_dir, True
+
+        return data_dir, False
+
+    def iter_output_data(self, job_id, role, party_id, task_name, output_key=None, chunksize=DEFAULT_CHUNK_SIZE,
+                         columns=None, output_cache: OutputCache = None, expand_predict_detail=False):
+        """
+        Yield (output_key, pandas.DataFrame) chunks of output data, read from output cache if the task's data is
+        cached, otherwise parsed directly from the downloading tar stream so nothing is held but the current chunk
+        """
+        data_dir = None
+        if output_cache is not None:
+            data_dir = output_cache.get_dir("data", OutputCacheKey(job_id, role, party_id, task_name, None))
+
+        if data_dir is not None:
+            for path in sorted(data_dir.glob("*/*.csv")):
+                if output_key is None or path.parent.name == output_key:
+                    yield from self._iter_output_csv(path.parent.name, path, chunksize, columns, expand_predict_detail)
+            return
+
+        response = self._client.output.download_data(job_id=job_id, role=role, party_id=party_id,
+                                                     task_name=task_name, output_key=output_key)
+        try:
+            for member, fileobj in iter_tar_members(response):
+                path = PurePosixPath(member.name)
+                if path.suffix != ".csv" or len(path.parts) < 2:
+                    continue
+                if output_key is None or path.parent.name == output_key:
+                    yield from self._iter_output_csv(path.parent.name, fileobj, chunksize, columns,
+                                                     expand_predict_detail)
+        except ValueError as e:
+            raise ValueError(f"query task={job_id}, role={role}, "
+                             f"party_id={party_id}'s output data is failed, {e}")
 
-            return output_data_dict
+    @staticmethod
+    def _iter_output_csv(output_key, path_or_buffer, chunksize, columns, expand_predict_detail):
+        for chunk in iter_output_csv(path_or_buffer, chunksize=chunksize, columns=columns,
+                                     expand=expand_predict_detail):
+            yield output_key, chunk
+
+    def _load_output_data(self, data_dir: Path, expand_predict_detail=False, columns=None):
+        output_keys = [output_key for output_key in os.listdir(data_dir) if data_dir.joinpath(output_key).is_dir()]
+        if not output_keys:
+            return None
+
+        output_data_dict = {}
+        for output_key in output_keys:
+            path = Path(data_dir).joinpath(output_key)
+            files = os.listdir(path)
+            file_names = []
+            for file in files:
+                if file.endswith(OUTPUT_FILE_SUFFIXES):
+                    file_names.append(file)
+
+            if len(file_names) == 1:
+                output_data_dict[output_key] = read_output_file(path.joinpath(file_names[0]), columns=columns,
+                                                                expand=expand_predict_detail)
+            else:
+                output_data_dict[output_key] = dict()
+                for file_name in file_names:
+                    output_data_dict[output_key][file_name] = read_output_file(path.joinpath(file_name),
+                                                                               columns=columns,
+                                                                               expand=expand_predict_detail)
+
+        return output_data_dict
+
+    def get_output_model(self, job_id, role, party_id, task_name, output_cache: OutputCache = None):
+        cache_key = OutputCacheKey(job_id, role, party_id, task_name, None)
+        if output_cache is not None:
+            model = output_cache.get("model", cache_key)
+            if model is not None:
+                return model
 
-    def get_output_model(self, job_id, role, party_id, task_name):
         response = self._client.output.query_model(job_id=job_id, role=role, party_id=party_id, task_name=task_name)
         try:
             code = response["code"]
             if code != 0:
                 raise ValueError(f"Return code {code}!=0")
             model = response["data"]
-            return model
         except BaseException:
             raise ValueError(f"query task={job_id}, role={role}, "
                              f"party_id={party_id}'s output model is failed, response={response}")
 
-    def get_output_metric(self, job_id, role, party_id, task_name):
+        if output_cache is not None and self._is_job_success(job_id, role, party_id):
+            output_cache.put("model", cache_key, model)
+
+        return model
+
+    def get_output_metric(self, job_id, role, party_id, task_name, output_cache: OutputCache = None):
+        cache_key = OutputCacheKey(job_id, role, party_id, task_name, None)
+        if output_cache is not None:
+            metrics = output_cache.get("metric", cache_key)
+            if metrics is not None:
+                return metrics
+
         response = self._client.output.query_metric(job_id=job_id, role=role, party_id=party_id, task_name=task_name)
         try:
             code = response["code"]
             if code != 0:
                 raise ValueError(f"Return code {code}!=0")
             metrics = response["data"]
-            return metrics
         except BaseException:
             raise ValueError(f"query task={job_id}, role={role}, "
                              f"party_id={party_id}'s output metrics is failed, response={response}")
 
+        if output_cache is not None and self._is_job_success(job_id, role, party_id):
+            output_cache.put("metric", cache_key, metrics)
+
+        return metrics
+
+    def _is_job_success(self, job_id, role, party_id):
+        """
+        outputs are only cached once the job succeeded, a running job may still overwrite them
+        """
+        try:
+            return self.query_job(job_id, role, party_id)["status"] == JobStatus.SUCCESS
+        except ValueError:
+            return False
+
     @staticmethod
-    def load_data_to_pd_df(path: Path):
-        import pandas as pd
-        import json
-        is_predict_task = False
-        template_col_names = ["label", "predict_result", "predict_score", "predict_detail", "type"]
-
-        with open(path, "r") as fin:
-            columns = set(fin.readline().strip().split(",", -1))
-            tot = 0
-            for col in template_col_names:
-                if col in columns:
-                    tot += 1
-
-            if tot >= 4:
-                is_predict_task = True
-
-        if is_predict_task:
-            data = []
-            columns = None
-            with open(path, "r") as fin:
-                for line in fin:
-                    if not columns:
-                        columns = line.strip().split(",")
-                    else:
-                        cols = line.strip().split(",", -1)
-                        predict_detail = json.loads(",".join(cols[len(columns) - 2: -1])[1:-1].replace("\'", "\""))
-                        value = cols[: len(columns) - 2] + [predict_detail] + cols[-1:]
-                        data.append(value)
-            return pd.DataFrame(data, columns=columns)
-        else:
-            return pd.read_csv(path)
-
-
-class JobStatus(object):
-    WAITING = 'waiting'
-    READY = 'ready'
-    RUNNING = "running"
-    CANCELED = "canceled"
-    TIMEOUT = "timeout"
-    FAILED = "failed"
-    PASS = "pass"
-    SUCCESS = "success"
+    def load_data_to_pd_df(path: Path, expand_predict_detail=False):
+        return read_output_csv(path, expand=expand_predict_detail)
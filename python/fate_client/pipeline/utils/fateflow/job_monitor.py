@@ -0,0 +1,439 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import asyncio
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(object):
+    WAITING = 'waiting'
+    READY = 'ready'
+    RUNNING = "running"
+    CANCELED = "canceled"
+    TIMEOUT = "timeout"
+    FAILED = "failed"
+    PASS = "pass"
+    SUCCESS = "success"
+
+    @classmethod
+    def end_status(cls):
+        return {cls.SUCCESS, cls.FAILED, cls.CANCELED, cls.TIMEOUT}
+
+    @classmethod
+    def is_end_status(cls, status):
+        return status in cls.end_status()
+
+    @classmethod
+    def active_status(cls):
+        return [cls.WAITING, cls.READY, cls.RUNNING]
+
+
+class PollingPolicy(object):
+    """
+    Exponential backoff with jitter: poll every min_interval seconds right after a state change,
+    then multiply the interval by backoff_factor while nothing changes, never exceeding max_interval.
+    """
+    def __init__(self, min_interval: float = 0.5, max_interval: float = 30.0,
+                 backoff_factor: float = 2.0, jitter: float = 0.1):
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError(f"Invalid polling interval range [{min_interval}, {max_interval}]")
+
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._backoff_factor = backoff_factor
+        self._jitter = jitter
+        self._interval = min_interval
+
+    @property
+    def min_interval(self):
+        return self._min_interval
+
+    def reset(self):
+        self._interval = self._min_interval
+
+    def next_interval(self) -> float:
+        interval = self._interval
+        self._interval = min(self._interval * self._backoff_factor, self._max_interval)
+        if self._jitter:
+            interval *= 1 + random.uniform(-self._jitter, self._jitter)
+
+        return interval
+
+
+class JobStatusSnapshot(object):
+    def __init__(self, job_id: str, status: str, running_tasks: tuple = (), job_data: dict = None):
+        self._job_id = job_id
+        self._status = status
+        self._running_tasks = tuple(running_tasks)
+        self._job_data = job_data or {}
+        self._timestamp = time.time()
+
+    @property
+    def job_id(self):
+        return self._job_id
+
+    @property
+    def status(self):
+        return self._status
+
+    @property
+    def running_tasks(self):
+        return self._running_tasks
+
+    @property
+    def job_data(self):
+        return self._job_data
+
+    @property
+    def progress(self):
+        return self._job_data.get("progress")
+
+    @property
+    def timestamp(self):
+        return self._timestamp
+
+    def is_end(self):
+        return JobStatus.is_end_status(self._status)
+
+    def state_key(self):
+        return self._status, self._running_tasks
+
+    def __repr__(self):
+        return f"JobStatusSnapshot(job_id={self._job_id}, status={self._status}, running_tasks={self._running_tasks})"
+
+
+class JobStatusEvent(object):
+    def __init__(self, job_id: str, pre_snapshot: Optional[JobStatusSnapshot], snapshot: JobStatusSnapshot,
+                 elapse: timedelta):
+        self.job_id = job_id
+        self.pre_status = pre_snapshot.status if pre_snapshot else None
+        self.pre_running_tasks = pre_snapshot.running_tasks if pre_snapshot else ()
+        self.status = snapshot.status
+        self.running_tasks = snapshot.running_tasks
+        self.elapse = elapse
+        self.snapshot = snapshot
+
+    def to_dict(self):
+        return dict(job_id=self.job_id,
+                    pre_status=self.pre_status,
+                    status=self.status,
+                    pre_running_tasks=list(self.pre_running_tasks),
+                    running_tasks=list(self.running_tasks),
+                    elapse=str(self.elapse))
+
+    def __repr__(self):
+        return f"JobStatusEvent({self.to_dict()})"
+
+
+class ConsoleJobListener(object):
+    def __call__(self, event: JobStatusEvent):
+        if event.pre_status is None:
+            print(f"Job id is {event.job_id}")
+
+        if event.status == JobStatus.SUCCESS:
+            print(f"Job is success!!! Job id is {event.job_id}, response_data={event.snapshot.job_data}")
+            print(f"Total time: {event.elapse}")
+        elif event.status == JobStatus.RUNNING:
+            tasks = list(event.running_tasks)
+            print(f"Running task {tasks[0] if len(tasks) == 1 else tasks}, time elapse: {event.elapse}")
+        else:
+            print(f"Job is {event.status}, time elapse: {event.elapse}")
+
+
+class JobMonitor(object):
+    """
+    Polls FATE-Flow for job status and emits a JobStatusEvent to every listener on each state transition,
+    a state is the job status together with its running tasks.
+
+    Task list is only queried while job is running and its progress moved since the last snapshot,
+    so a long-running task costs one request per poll instead of two.
+
+    A failed poll is retried on the next tick, watch only gives up after max_consecutive_errors failed polls
+    in a row.
+    """
+    def __init__(self, flow_job_invoker, polling_policy: PollingPolicy = None,
+                 listeners: List[Callable[[JobStatusEvent], None]] = None, max_consecutive_errors: int = 5):
+        self._invoker = flow_job_invoker
+        self._max_consecutive_errors = max_consecutive_errors
+        self._polling_policy = polling_policy if polling_policy else PollingPolicy()
+        self._listeners = list(listeners) if listeners else []
+
+    def add_listener(self, listener: Callable[[JobStatusEvent], None]):
+        self._listeners.append(listener)
+
+    def snapshot(self, job_id, role, party_id, pre_snapshot: JobStatusSnapshot = None) -> JobStatusSnapshot:
+        job_data = self._invoker.query_job(job_id, role, party_id)
+        status = job_data["status"]
+        if status != JobStatus.RUNNING:
+            return JobStatusSnapshot(job_id, status, job_data=job_data)
+
+        progress = job_data.get("progress")
+        if pre_snapshot is not None and pre_snapshot.status == JobStatus.RUNNING and pre_snapshot.running_tasks \
+                and progress is not None and progress == pre_snapshot.progress:
+            return JobStatusSnapshot(job_id, status, running_tasks=pre_snapshot.running_tasks, job_data=job_data)
+
+        code, data = self._invoker.query_task(job_id=job_id, role=role, party_id=party_id,
+                                              status=JobStatus.RUNNING)
+        running_tasks = [task_data["task_name"] for task_data in data] if code == 0 and data else []
+
+        return JobStatusSnapshot(job_id, status, running_tasks=running_tasks, job_data=job_data)
+
+    def watch(self, job_id, role, party_id, timeout: float = None) -> JobStatusSnapshot:
+        """
+        Block until job reaches an end status and return the final snapshot,
+        raise TimeoutError if it does not finish in timeout seconds.
+        """
+        start_time = time.time()
+        pre_snapshot = None
+        error_count = 0
+        self._polling_policy.reset()
+
+        while True:
+            try:
+                snapshot = self.snapshot(job_id, role, party_id, pre_snapshot=pre_snapshot)
+            except Exception as e:
+                error_count += 1
+                if error_count >= self._max_consecutive_errors:
+                    raise
+                logger.warning(f"poll job {job_id} failed ({error_count}/{self._max_consecutive_errors}): {e}")
+            else:
+                error_count = 0
+                if pre_snapshot is None or snapshot.state_key() != pre_snapshot.state_key():
+                    self._emit(JobStatusEvent(job_id, pre_snapshot, snapshot,
+                                              elapse=timedelta(seconds=int(time.time() - start_time))))
+                    self._polling_policy.reset()
+
+                if snapshot.is_end():
+                    return snapshot
+
+                pre_snapshot = snapshot
+
+            interval = self._polling_policy.next_interval()
+            if timeout is not None:
+                remaining = start_time + timeout - time.time()
+                if remaining <= 0:
+                    status = pre_snapshot.status if pre_snapshot is not None else None
+                    raise TimeoutError(f"Job {job_id} does not finish in {timeout} seconds, status={status}")
+                interval = min(interval, remaining)
+
+            time.sleep(interval)
+
+    def _emit(self, event: JobStatusEvent):
+        for listener in self._listeners:
+            listener(event)
+
+
+class _MonitoredJob(object):
+    def __init__(self, job_id, role, party_id):
+        self.job_id = job_id
+        self.role = role
+        self.party_id = party_id
+        self.future = Future()
+        self.start_time = time.time()
+        self.snapshot = None
+        self.error_count = 0
+
+
+class JobMonitorPool(object):
+    """
+    Monitors many jobs from one scheduler thread. On every tick, jobs are grouped by (role, party_id) and
+    each group is resolved by listing the waiting, ready and running jobs of that party page by page, so the
+    request rate follows the polling interval and the number of active jobs on the server rather than the
+    number of monitored jobs. A job missing from those lists has ended, only then it is queried by itself.
+    Groups smaller than the number of listed statuses are queried job by job, which is cheaper.
+
+    Usage:
+        with JobMonitorPool(FATEFlowJobInvoker()) as pool:
+            futures = pool.add_jobs([(job_id, "guest", "9999") for job_id in job_ids])
+            snapshots = [future.result() for future in futures]
+    """
+    def __init__(self, flow_job_invoker, polling_policy: PollingPolicy = None,
+                 listeners: List[Callable[[JobStatusEvent], None]] = None, max_consecutive_errors: int = 5,
+                 page_size: int = 100):
+        self._invoker = flow_job_invoker
+        self._page_size = page_size
+        self._polling_policy = polling_policy if polling_policy else PollingPolicy()
+        self._listeners = list(listeners) if listeners else []
+        self._max_consecutive_errors = max_consecutive_errors
+
+        self._jobs: Dict[Tuple[str, str, str], _MonitoredJob] = dict()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def add_listener(self, listener: Callable[[JobStatusEvent], None]):
+        self._listeners.append(listener)
+
+    def add_job(self, job_id, role, party_id) -> Future:
+        """
+        Returns a concurrent.futures.Future resolved with the JobStatusSnapshot of the job's end status
+        """
+        key = (job_id, role, str(party_id))
+        with self._lock:
+            if key not in self._jobs:
+                self._jobs[key] = _MonitoredJob(job_id, role, str(party_id))
+            future = self._jobs[key].future
+
+        self.start()
+        self._polling_policy.reset()
+        self._wakeup.set()
+        return future
+
+    def add_jobs(self, jobs: Iterable[Tuple[str, str, str]]) -> List[Future]:
+        return [self.add_job(job_id, role, party_id) for job_id, role, party_id in jobs]
+
+    def wait_job(self, job_id, role, party_id) -> asyncio.Future:
+        """
+        Awaitable flavour of add_job, should be called inside a running event loop
+        """
+        return asyncio.wrap_future(self.add_job(job_id, role, party_id))
+
+    @property
+    def pending_jobs(self):
+        with self._lock:
+            return [key for key, job in self._jobs.items() if not job.future.done()]
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="job_monitor_pool", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                if self.poll_once():
+                    self._polling_policy.reset()
+            except Exception as e:
+                logger.exception("job monitor pool failed to poll jobs")
+                self._fail_pending(e)
+
+            with self._lock:
+                has_pending = any(not job.future.done() for job in self._jobs.values())
+
+            if not has_pending:
+                self._wakeup.wait()
+            else:
+                self._wakeup.wait(self._polling_policy.next_interval())
+            self._wakeup.clear()
+
+    def poll_once(self) -> bool:
+        """
+        Refresh every pending job once, return True if any job changes its status
+        """
+        groups: Dict[Tuple[str, str], List[_MonitoredJob]] = dict()
+        with self._lock:
+            for key in list(self._jobs.keys()):
+                job = self._jobs[key]
+                if job.future.done():
+                    self._jobs.pop(key)
+                    continue
+                groups.setdefault((job.role, job.party_id), []).append(job)
+
+        changed = False
+        for (role, party_id), jobs in groups.items():
+            if len(jobs) < len(JobStatus.active_status()):
+                job_data_dict = dict()
+            else:
+                job_data_dict = self._query_job_group(role, party_id)
+            for job in jobs:
+                job_data = job_data_dict.get(job.job_id)
+                try:
+                    if job_data is None:
+                        job_data = self._invoker.query_job(job.job_id, job.role, job.party_id)
+                    snapshot = JobStatusSnapshot(job.job_id, job_data["status"], job_data=job_data)
+                except Exception as e:
+                    job.error_count += 1
+                    if job.error_count >= self._max_consecutive_errors and not job.future.done():
+                        job.future.set_exception(e)
+                    continue
+
+                job.error_count = 0
+                changed |= self._update(job, snapshot)
+
+        return changed
+
+    def _fail_pending(self, exception):
+        with self._lock:
+            jobs = list(self._jobs.values())
+
+        for job in jobs:
+            if not job.future.done():
+                job.future.set_exception(exception)
+
+    def _query_job_group(self, role, party_id) -> Dict[str, dict]:
+        """
+        Active jobs of (role, party_id) by job_id, empty if listing fails so every job is queried by itself
+        """
+        job_data_dict = dict()
+        try:
+            for status in JobStatus.active_status():
+                page = 1
+                while True:
+                    job_list = self._invoker.query_job_list(role=role, party_id=party_id, status=status,
+                                                            limit=self._page_size, page=page)
+                    for job_data in job_list:
+                        if str(job_data.get("party_id")) == party_id and job_data.get("role") == role:
+                            job_data_dict[job_data["job_id"]] = job_data
+                    if len(job_list) < self._page_size:
+                        break
+                    page += 1
+        except Exception:
+            logger.exception(f"list jobs of role={role}, party_id={party_id} failed, query them one by one")
+            return dict()
+
+        return job_data_dict
+
+    def _update(self, job: _MonitoredJob, snapshot: JobStatusSnapshot) -> bool:
+        pre_snapshot = job.snapshot
+        if pre_snapshot is not None and pre_snapshot.state_key() == snapshot.state_key():
+            return False
+
+        job.snapshot = snapshot
+        event = JobStatusEvent(job.job_id, pre_snapshot, snapshot,
+                               elapse=timedelta(seconds=int(time.time() - job.start_time)))
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception:
+                logger.exception(f"listener {listener} of job monitor pool failed on {event}")
+
+        if snapshot.is_end() and not job.future.done():
+            job.future.set_result(snapshot)
+
+        return True
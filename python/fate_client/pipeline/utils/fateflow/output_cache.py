@@ -0,0 +1,248 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import copy
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+from typing import Any, Optional
+
+from ...conf.env_config import OutputCacheConfig
+
+OutputCacheKey = namedtuple("OutputCacheKey", ["job_id", "role", "party_id", "task_name", "output_key"])
+
+MANIFEST_FILE = "manifest.json"
+PAYLOAD_FILE = "payload.json"
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _file_checksum(path):
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as fin:
+        for chunk in iter(lambda: fin.read(_HASH_CHUNK_SIZE), b""):
+            sha256.update(chunk)
+
+    return sha256.hexdigest()
+
+
+class OutputCache(object):
+    """
+    Two-level cache of task outputs of finished jobs, an in-memory LRU of loaded objects in front of
+    an on-disk store bounded by max_size bytes.
+
+    Each disk entry is a directory named by the sha256 of (kind, job_id, role, party_id, task_name, output_key),
+    its manifest records the key and the sha256 of every file, which is verified the first time the entry is
+    read in a process. Entries are evicted by least recent access once the store exceeds max_size.
+
+    The memory layer keeps its own copies, objects returned from it may be modified by the caller.
+    """
+    def __init__(self, directory, max_size=OutputCacheConfig.MAX_SIZE, memory_items=OutputCacheConfig.MEMORY_ITEMS):
+        self._directory = Path(directory)
+        self._max_size = max_size
+        self._memory_items = memory_items
+        self._memory = OrderedDict()
+        self._verified = set()
+        self._lock = threading.RLock()
+
+    @property
+    def directory(self):
+        return self._directory
+
+    @staticmethod
+    def _entry_id(kind, key: OutputCacheKey):
+        return hashlib.sha256("\x00".join(map(str, (kind, ) + tuple(key))).encode("utf-8")).hexdigest()
+
+    def _entry_path(self, kind, key):
+        return self._directory.joinpath(self._entry_id(kind, key))
+
+    def get_memory(self, kind, key: OutputCacheKey) -> Optional[Any]:
+        with self._lock:
+            memory_key = (kind, key)
+            if memory_key not in self._memory:
+                return None
+            self._memory.move_to_end(memory_key)
+            obj = self._memory[memory_key]
+
+        return copy.deepcopy(obj)
+
+    def put_memory(self, kind, key: OutputCacheKey, obj):
+        if self._memory_items <= 0:
+            return
+        obj = copy.deepcopy(obj)
+        with self._lock:
+            self._memory[(kind, key)] = obj
+            self._memory.move_to_end((kind, key))
+            while len(self._memory) > self._memory_items:
+                self._memory.popitem(last=False)
+
+    def get_dir(self, kind, key: OutputCacheKey) -> Optional[Path]:
+        entry_path = self._entry_path(kind, key)
+        manifest_path = entry_path.joinpath(MANIFEST_FILE)
+        try:
+            with manifest_path.open("r") as fin:
+                manifest = json.load(fin)
+        except (OSError, ValueError):
+            return None
+
+        with self._lock:
+            if entry_path.name not in self._verified:
+                for file_name, checksum in manifest["files"].items():
+                    file_path = entry_path.joinpath(file_name)
+                    if not file_path.is_file() or _file_checksum(file_path) != checksum:
+                        self.remove(kind, key)
+                        return None
+                self._verified.add(entry_path.name)
+
+        os.utime(manifest_path)
+        return entry_path
+
+    def put_dir(self, kind, key: OutputCacheKey, src_dir, move=False) -> Optional[Path]:
+        """
+        Store files under src_dir, they are moved instead of copied if move=True
+
+        Returns:
+            path of the entry, None if the files are larger than max_size and so not stored, src_dir is left as is
+        """
+        size = 0
+        for root, _, file_names in os.walk(src_dir):
+            for file_name in file_names:
+                size += Path(root).joinpath(file_name).stat().st_size
+        if size > self._max_size:
+            return None
+
+        self._directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._directory.joinpath(f".tmp_{uuid.uuid1().hex}")
+        if move:
+            shutil.move(str(src_dir), str(tmp_path))
+        else:
+            shutil.copytree(str(src_dir), str(tmp_path))
+
+        files = dict()
+        for root, _, file_names in os.walk(tmp_path):
+            for file_name in file_names:
+                file_path = Path(root).joinpath(file_name)
+                files[str(file_path.relative_to(tmp_path))] = _file_checksum(file_path)
+
+        manifest = dict(kind=kind, key=key._asdict(), files=files, size=size, create_time=time.time())
+        with tmp_path.joinpath(MANIFEST_FILE).open("w") as fout:
+            json.dump(manifest, fout)
+
+        entry_path = self._entry_path(kind, key)
+        with self._lock:
+            if entry_path.exists():
+                shutil.rmtree(entry_path, ignore_errors=True)
+            os.replace(tmp_path, entry_path)
+            self._verified.add(entry_path.name)
+
+        self.evict(keep=entry_path.name)
+        return entry_path
+
+    def get(self, kind, key: OutputCacheKey) -> Optional[Any]:
+        obj = self.get_memory(kind, key)
+        if obj is not None:
+            return obj
+
+        entry_path = self.get_dir(kind, key)
+        if entry_path is None:
+            return None
+
+        with entry_path.joinpath(PAYLOAD_FILE).open("r") as fin:
+            obj = json.load(fin)
+
+        self.put_memory(kind, key, obj)
+        return obj
+
+    def put(self, kind, key: OutputCacheKey, obj):
+        """
+        Store a json serializable object
+        """
+        self._directory.mkdir(parents=True, exist_ok=True)
+        src_dir = self._directory.joinpath(f".src_{uuid.uuid1().hex}")
+        src_dir.mkdir()
+        with src_dir.joinpath(PAYLOAD_FILE).open("w") as fout:
+            json.dump(obj, fout)
+
+        if self.put_dir(kind, key, src_dir, move=True) is None:
+            shutil.rmtree(src_dir, ignore_errors=True)
+            return
+        self.put_memory(kind, key, obj)
+
+    def remove(self, kind, key: OutputCacheKey):
+        entry_path = self._entry_path(kind, key)
+        with self._lock:
+            self._memory.pop((kind, key), None)
+            self._verified.discard(entry_path.name)
+            shutil.rmtree(entry_path, ignore_errors=True)
+
+    def evict(self, keep=None):
+        """
+        Remove least recently accessed entries until the store fits max_size, the entry named keep is never removed
+        """
+        entries = []
+        total_size = 0
+        for entry_path in self._directory.iterdir():
+            if entry_path.name.startswith("."):
+                continue
+            try:
+                manifest_path = entry_path.joinpath(MANIFEST_FILE)
+                with manifest_path.open("r") as fin:
+                    size = json.load(fin)["size"]
+                mtime = manifest_path.stat().st_mtime
+            except (OSError, ValueError, KeyError):
+                continue
+            total_size += size
+            if entry_path.name != keep:
+                entries.append((mtime, size, entry_path))
+
+        entries.sort()
+        with self._lock:
+            for _, size, entry_path in entries:
+                if total_size <= self._max_size:
+                    break
+                shutil.rmtree(entry_path, ignore_errors=True)
+                self._verified.discard(entry_path.name)
+                total_size -= size
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._verified.clear()
+            shutil.rmtree(self._directory, ignore_errors=True)
+
+
+_output_cache = None
+_output_cache_lock = threading.Lock()
+
+
+def get_output_cache() -> Optional[OutputCache]:
+    """
+    Process-wide cache configured by pipeline.output_cache in settings.yaml, None unless it is enabled there
+    """
+    global _output_cache
+    if not OutputCacheConfig.ENABLE:
+        return None
+
+    with _output_cache_lock:
+        if _output_cache is None:
+            _output_cache = OutputCache(OutputCacheConfig.DIRECTORY,
+                                        max_size=OutputCacheConfig.MAX_SIZE,
+                                        memory_items=OutputCacheConfig.MEMORY_ITEMS)
+
+    return _output_cache
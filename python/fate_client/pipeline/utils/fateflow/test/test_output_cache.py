@@ -0,0 +1,43 @@
+import os
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from fate_client.pipeline.utils.fateflow.output_cache import OutputCache, OutputCacheKey
+
+
+def write_output(directory, size):
+    output_dir = Path(directory).joinpath("train_output_data")
+    output_dir.mkdir(parents=True)
+    with output_dir.joinpath("data.csv").open("wb") as fout:
+        fout.write(os.urandom(size))
+    return directory
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = OutputCache(Path(tmp_dir).joinpath("cache"), max_size=4096, memory_items=2)
+
+        small = OutputCacheKey("job_0", "guest", "9999", "reader_0", None)
+        entry_path = cache.put_dir("data", small, write_output(Path(tmp_dir).joinpath("small"), 1024), move=True)
+        assert entry_path is not None and cache.get_dir("data", small) == entry_path
+
+        large = OutputCacheKey("job_1", "guest", "9999", "reader_0", None)
+        large_dir = write_output(Path(tmp_dir).joinpath("large"), 8192)
+        assert cache.put_dir("data", large, large_dir, move=True) is None
+        assert large_dir.joinpath("train_output_data", "data.csv").is_file()
+        assert cache.get_dir("data", large) is None and cache.get_dir("data", small) == entry_path
+        print("entry larger than max_size is not cached and its files are kept")
+
+        newer = OutputCacheKey("job_2", "guest", "9999", "reader_0", None)
+        newer_path = cache.put_dir("data", newer, write_output(Path(tmp_dir).joinpath("newer"), 3584), move=True)
+        assert newer_path is not None and newer_path.joinpath("train_output_data", "data.csv").is_file()
+        assert cache.get_dir("data", small) is None
+        print("older entry evicted, the inserted one is kept")
+
+        cache.put_memory("data", small, {"train_output_data": pd.DataFrame({"id": ["001", "002"]})})
+        df = cache.get_memory("data", small)["train_output_data"]
+        df.loc[0, "id"] = "changed"
+        assert cache.get_memory("data", small)["train_output_data"].loc[0, "id"] == "001"
+        print("objects returned from the memory layer are copies")
@@ -0,0 +1,116 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from ...conf.env_config import UploadDedupConfig
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+# upload options which only change how the file is sent, every other option shapes the uploaded table
+TRANSPORT_OPTIONS = frozenset(["progress_callback", "compress"])
+
+
+class UploadIndex(object):
+    """
+    Local index of uploaded tables, (namespace, name) -> fingerprint of the file, meta, head, extend_sid and
+    the other table shaping upload options such as partitions it was built from. Content hashes are memoized by file path, size and mtime so an unchanged file is
+    not read again.
+    """
+    def __init__(self, path):
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._index = dict(tables=dict(), files=dict())
+        try:
+            with self._path.open("r") as fin:
+                index = json.load(fin)
+            self._index["tables"].update(index.get("tables", {}))
+            self._index["files"].update(index.get("files", {}))
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def _table_key(namespace, name):
+        return json.dumps([namespace, name])
+
+    def _file_hash(self, file):
+        file = os.path.abspath(file)
+        stat = os.stat(file)
+        with self._lock:
+            memo = self._index["files"].get(file)
+        if memo and memo["size"] == stat.st_size and memo["mtime"] == stat.st_mtime_ns:
+            return memo["sha256"]
+
+        sha256 = hashlib.sha256()
+        with open(file, "rb") as fin:
+            for chunk in iter(lambda: fin.read(_HASH_CHUNK_SIZE), b""):
+                sha256.update(chunk)
+
+        with self._lock:
+            self._index["files"][file] = dict(size=stat.st_size, mtime=stat.st_mtime_ns, sha256=sha256.hexdigest())
+        return sha256.hexdigest()
+
+    def fingerprint(self, file, meta, head, extend_sid, **upload_options) -> str:
+        """
+        Args:
+            upload_options: other options of the upload, e.g. partitions, TRANSPORT_OPTIONS are left out
+        """
+        options = {key: value for key, value in upload_options.items() if key not in TRANSPORT_OPTIONS}
+        options.update(meta=meta, head=head, extend_sid=extend_sid)
+        options = json.dumps(options, sort_keys=True, default=str)
+        return hashlib.sha256(f"{self._file_hash(file)}\x00{options}".encode("utf-8")).hexdigest()
+
+    def contains(self, fingerprint, namespace, name) -> bool:
+        with self._lock:
+            return self._index["tables"].get(self._table_key(namespace, name)) == fingerprint
+
+    def record(self, fingerprint, namespace, name):
+        with self._lock:
+            self._index["tables"][self._table_key(namespace, name)] = fingerprint
+            self._save()
+
+    def discard(self, namespace, name):
+        with self._lock:
+            if self._index["tables"].pop(self._table_key(namespace, name), None) is not None:
+                self._save()
+
+    def _save(self):
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp_path.open("w") as fout:
+            json.dump(self._index, fout)
+        os.replace(tmp_path, self._path)
+
+
+_upload_index = None
+_upload_index_lock = threading.Lock()
+
+
+def get_upload_index() -> Optional[UploadIndex]:
+    """
+    Process-wide index configured by pipeline.upload_dedup in settings.yaml, None unless it is enabled there
+    """
+    global _upload_index
+    if not UploadDedupConfig.ENABLE:
+        return None
+
+    with _upload_index_lock:
+        if _upload_index is None:
+            _upload_index = UploadIndex(UploadDedupConfig.INDEX_PATH)
+
+    return _upload_index
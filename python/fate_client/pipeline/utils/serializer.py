@@ -0,0 +1,65 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""
+Serializers of DAG dicts used by Pipeline.get_dag / Pipeline.deploy:
+    yaml:   same document as before, pure python dumper
+    yaml_c: libyaml based CSafeDumper when ruamel.yaml.clib is installed, falls back to yaml otherwise.
+            several times faster, the document is equivalent but may quote scalars differently, e.g. 'binary:bce'
+    json:   canonical json, sorted keys and no whitespace, byte-stable for the same DAG, much faster than yaml
+More can be added by register_serializer.
+"""
+import json
+
+from ruamel import yaml
+
+try:
+    from ruamel.yaml import CSafeDumper as _CSafeDumper
+except ImportError:
+    _CSafeDumper = yaml.SafeDumper
+
+
+def dump_yaml(data: dict) -> str:
+    return yaml.safe_dump(data)
+
+
+def dump_yaml_c(data: dict) -> str:
+    return yaml.dump(data, Dumper=_CSafeDumper)
+
+
+def dump_json(data: dict) -> str:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+_serializers = dict(
+    yaml=dump_yaml,
+    yaml_c=dump_yaml_c,
+    json=dump_json
+)
+
+
+def register_serializer(name, serializer):
+    """
+    Args:
+        name: name used by get_dag(serializer=name) and deploy(serializer=name)
+        serializer: callable, dict -> str
+    """
+    _serializers[name] = serializer
+
+
+def serialize(data: dict, serializer="yaml") -> str:
+    if serializer not in _serializers:
+        raise ValueError(f"serializer {serializer} is not supported, should be one of {list(_serializers)}")
+
+    return _serializers[serializer](data)
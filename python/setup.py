@@ -35,7 +35,8 @@ install_requires = [
 
 extras_require = {
     "fate": ["pyfate==2.1.0"],
-    "fate_flow": ["fate_flow==2.1.0"]
+    "fate_flow": ["fate_flow==2.1.0"],
+    "parquet": ["pyarrow"]
 }
 entry_points = {"console_scripts": ["flow = fate_client.flow_cli.flow:flow_cli",
                                     "pipeline = fate_client.pipeline.pipeline_cli:pipeline_group"]}